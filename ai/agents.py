@@ -1,35 +1,32 @@
 import numpy as np
-import torch
-import torch.nn as nn
-import torch.optim as optim
 from collections import deque
 import random
 from heapq import heappop, heappush
-import time
-
-class DQN(nn.Module):
-    def __init__(self, input_dim, output_dim):
-        super(DQN, self).__init__()
-        self.fc1 = nn.Linear(input_dim, 128)
-        self.fc2 = nn.Linear(128, 128)
-        self.fc3 = nn.Linear(128, output_dim)
-        self.computation_times = []
-
-    def forward(self, x):
-        start_time = time.time()
-        x = torch.relu(self.fc1(x))
-        x = torch.relu(self.fc2(x))
-        x = self.fc3(x)
-        end_time = time.time()
-        self.computation_times.append(end_time - start_time)
-        return x
-
-    def print_efficiency_metrics(self):
-        if self.computation_times:
-            avg_time = sum(self.computation_times) / len(self.computation_times)
-            print(f"Average Computation Time per Forward Pass: {avg_time:.6f} seconds")
-        else:
-            print("No computation times recorded.")
+from ai.dstar import DStarLite
+
+def guard_features(padded_walkable, grids, positions, player_pos):
+    """(N, 10) DQN inputs: position, offset and direction to the player, open sides.
+
+    padded_walkable is a (G, rows + 2, cols + 2) stack of walkability grids
+    with a blocked border, and grids picks the grid of each row (a scalar
+    for all of them, or an (N,) array).
+    """
+    size = np.array([padded_walkable.shape[2] - 2, padded_walkable.shape[1] - 2])
+    offset = player_pos - positions
+    features = np.empty((len(positions), 10), dtype=np.float32)
+    features[:, 0:2] = positions / size
+    features[:, 2:4] = offset / size
+    features[:, 4:6] = np.sign(offset)
+    # Walkability of the up, down, left and right neighbours (off-grid counts as blocked)
+    x, y = positions[:, 0] + 1, positions[:, 1] + 1
+    for i, (dx, dy) in enumerate(VecGuardEnv.ACTION_DELTAS):
+        features[:, 6 + i] = padded_walkable[grids, y + dy, x + dx]
+    return features
+
+def encode_guard_features(guard_positions, player_pos, nav_grid):
+    """guard_features for guards sharing one NavGrid"""
+    positions = np.asarray(guard_positions, dtype=np.int64).reshape(-1, 2)
+    return guard_features(np.pad(nav_grid.walkable, 1)[None], 0, positions, np.asarray(player_pos))
 
 class GuardEnv:
     def __init__(self, maze_size, walls, player_pos):
@@ -81,16 +78,104 @@ class GuardEnv:
     def _manhattan_distance(self, pos1, pos2):
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
+class VecGuardEnv:
+    """N GuardEnv episodes on N mazes, stepped together on NumPy arrays.
+
+    walkable is an (N, rows, cols) array (1 = floor) or a list of equally sized
+    NavGrids. States are (N, 4) int arrays of guard x, guard y and the signs of
+    the player direction. Finished episodes reset automatically and their last
+    state is returned in info["final_states"].
+    """
+    ACTION_DELTAS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)])  # up, down, left, right
+
+    def __init__(self, walkable, player_positions, start_positions=None, max_steps=None, seed=None):
+        if not isinstance(walkable, np.ndarray):
+            walkable = np.stack([grid.walkable for grid in walkable])
+        self.walkable = walkable.astype(bool)
+        self.num_envs, self.height, self.width = self.walkable.shape
+        self.maze_size = (self.width, self.height)
+        self.player_pos = np.asarray(player_positions, dtype=np.int64).reshape(self.num_envs, 2)
+        # Without fixed start positions, guards respawn on a random floor tile
+        self.start_positions = None if start_positions is None else \
+            np.asarray(start_positions, dtype=np.int64).reshape(self.num_envs, 2)
+        self.max_steps = max_steps
+        self.action_space = ['up', 'down', 'left', 'right']
+        self.rng = np.random.default_rng(seed)
+        self.env_index = np.arange(self.num_envs)
+        self._floor_counts = np.cumsum(self.walkable.reshape(self.num_envs, -1), axis=1)
+        self._padded_walkable = np.pad(self.walkable, ((0, 0), (1, 1), (1, 1)))
+        self.guard_pos = np.zeros((self.num_envs, 2), dtype=np.int64)
+        self.steps = np.zeros(self.num_envs, dtype=np.int64)
+
+    def reset(self):
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self._get_state()
+
+    def _reset_envs(self, mask):
+        self.steps[mask] = 0
+        if self.start_positions is not None:
+            self.guard_pos[mask] = self.start_positions[mask]
+            return
+        # Pick the r-th floor tile of each maze via its running floor count
+        counts = self._floor_counts[mask]
+        picks = self.rng.integers(0, counts[:, -1])
+        flat = (counts > picks[:, None]).argmax(axis=1)
+        self.guard_pos[mask, 0] = flat % self.width
+        self.guard_pos[mask, 1] = flat // self.width
+
+    def step(self, actions):
+        new_pos = self.guard_pos + self.ACTION_DELTAS[np.asarray(actions)]
+        valid = self._is_valid_move(new_pos)
+        self.guard_pos[valid] = new_pos[valid]
+        self.steps += 1
+
+        rewards = self._get_reward()
+        dones = self._is_done()
+        truncated = self.steps >= self.max_steps if self.max_steps else np.zeros(self.num_envs, dtype=bool)
+        states = self._get_state()
+        infos = {"final_states": states.copy(), "truncated": truncated}
+
+        finished = dones | truncated
+        if finished.any():
+            self._reset_envs(finished)
+            states = self._get_state()
+        return states, rewards, dones, infos
+
+    def _get_state(self):
+        player_direction = np.sign(self.player_pos - self.guard_pos)
+        return np.concatenate([self.guard_pos, player_direction], axis=1)
+
+    def get_features(self, guard_pos=None):
+        """encode_guard_features for every environment, so trained models drive in-game guards"""
+        positions = self.guard_pos if guard_pos is None else guard_pos
+        return guard_features(self._padded_walkable, self.env_index, positions, self.player_pos)
+
+    def _is_valid_move(self, pos):
+        x, y = pos[:, 0], pos[:, 1]
+        in_bounds = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        return in_bounds & self.walkable[
+            self.env_index, np.clip(y, 0, self.height - 1), np.clip(x, 0, self.width - 1)
+        ]
+
+    def _get_reward(self):
+        return -self._manhattan_distance(self.guard_pos, self.player_pos)
+
+    def _is_done(self):
+        return self._manhattan_distance(self.guard_pos, self.player_pos) < 3
+
+    def _manhattan_distance(self, pos1, pos2):
+        return np.abs(pos1 - pos2).sum(axis=1)
+
 class GuardAgent:
-    def __init__(self, position, maze_size):
+    def __init__(self, position, maze_size, pathfinder=None):
         self.position = position
         self.maze_size = maze_size
-        self.update_timer = 0
-        self.path_update_interval = 30  # Delay before targeting player directly
+        self.pathfinder = pathfinder  # Optional engine from utils.pathfinding
         self.personality = random.random()  # Add randomized personality trait
         self.error_rate = random.uniform(0.1, 0.3)  # Each guard has different error rate
+        self.planner = None  # DStarLite search kept between ticks in "dstar" mode
 
-    def find_path_to_player(self, start, target, walls):
+    def find_path_to_player(self, start, target, nav_grid):
         """A* pathfinding with intentional errors"""
         if start == target:
             return []
@@ -104,6 +189,15 @@ class GuardAgent:
                 max(0, min(self.maze_size[1]-1, target[1] + offset_y))
             )
 
+        # Unreachable targets are redirected up front instead of draining a full search
+        if not nav_grid.same_component(start, target):
+            target = self.find_nearest_reachable(start, target, nav_grid)
+            if target is None or target == start:
+                return []
+
+        if self.pathfinder is not None:
+            return self.find_path_with_engine(start, target, nav_grid)
+
         open_set = [(0, start)]
         came_from = {}
         g_score = {start: 0}
@@ -132,10 +226,7 @@ class GuardAgent:
             for dx, dy in directions:
                 next_pos = (current[0] + dx, current[1] + dy)
                 
-                if (0 <= next_pos[0] < self.maze_size[0] and 
-                    0 <= next_pos[1] < self.maze_size[1] and 
-                    next_pos not in walls):
-                    
+                if nav_grid.is_walkable(*next_pos):
                     # Add some random cost to create path variation
                     random_cost = random.uniform(0.8, 1.2) if random.random() < self.error_rate else 1.0
                     tentative_g = g_score[current] + random_cost
@@ -146,32 +237,44 @@ class GuardAgent:
                         f_score = tentative_g + self.manhattan_distance(next_pos, target)
                         heappush(open_set, (f_score, next_pos))
 
-        nearest_pos = self.find_nearest_reachable(start, target, walls)
-        if nearest_pos != start:
-            return self.find_path_to_player(start, nearest_pos, walls)
         return []
 
-    def find_nearest_reachable(self, start, target, walls):
-        """Find nearest reachable point with some randomness"""
-        best_dist = float('inf')
-        best_pos = start
-        search_radius = random.randint(3, 7)  # Randomize search radius
-        
-        for dx in range(-search_radius, search_radius + 1):
-            for dy in range(-search_radius, search_radius + 1):
-                check_pos = (target[0] + dx, target[1] + dy)
-                if (0 <= check_pos[0] < self.maze_size[0] and
-                    0 <= check_pos[1] < self.maze_size[1] and
-                    check_pos not in walls):
-                    dist = self.manhattan_distance(check_pos, target)
-                    # Add random factor to distance calculation
-                    if random.random() < self.error_rate:
-                        dist *= random.uniform(0.8, 1.2)
-                    if dist < best_dist:
-                        best_dist = dist
-                        best_pos = check_pos
-        
-        return best_pos
+    def find_path_with_engine(self, start, target, nav_grid):
+        """Exact search with the configured engine; noise only on the target and path"""
+        path = self.pathfinder(nav_grid, start, target)[1:]
+        if len(path) > 3 and random.random() < self.error_rate:
+            return path[::2]
+        return path
+
+    def follow_policy_action(self, start, action, nav_grid):
+        """Single-step path for a learned policy's action, empty if it walks into a wall"""
+        dx, dy = VecGuardEnv.ACTION_DELTAS[action]
+        next_pos = (start[0] + int(dx), start[1] + int(dy))
+        return [next_pos] if nav_grid.is_walkable(*next_pos) else []
+
+    def wander(self, start, nav_grid):
+        """Single random step to an open neighbour; wandering without a search"""
+        neighbors = nav_grid.neighbors(start)
+        return [random.choice(neighbors)] if neighbors else []
+
+    def follow_flow_field(self, start, flow_field):
+        """Single-step path down the shared flow field, with this guard's noise"""
+        next_pos = flow_field.next_step(start, self.error_rate, self.personality)
+        return [next_pos] if next_pos else []
+
+    def follow_incremental_plan(self, start, target, nav_grid):
+        """Single-step path from this guard's D* Lite search, repaired rather than redone each call"""
+        if self.planner is None:
+            self.planner = DStarLite()
+        next_pos = self.planner.next_step(nav_grid, start, target)
+        return [next_pos] if next_pos else []
+
+    def find_nearest_reachable(self, start, target, nav_grid):
+        """Closest tile to target in the same connected component as start"""
+        label = nav_grid.component_at(*start)
+        if label == 0:
+            return None
+        return nav_grid.nearest_in_component(label, target)
 
     def manhattan_distance(self, pos1, pos2):
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
@@ -0,0 +1,21 @@
+import importlib
+
+# Learning backends by name, as (module, class). Modules are imported on first
+# use, so selecting "qlearning" never pulls in torch and plain A* guards load
+# neither.
+BACKENDS = {
+    "dqn": ("ai.dqn", "DQN"),
+    "dqn_trainer": ("ai.dqn", "DQNTrainer"),
+    "qlearning": ("ai.reinforcement", "QLearning"),
+    "dense_qlearning": ("ai.reinforcement", "DenseQLearning"),
+}
+
+def get_backend(name):
+    """The backend class registered under name, importing its module if needed"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown AI backend {name!r}, expected one of {sorted(BACKENDS)}")
+    module_name, class_name = BACKENDS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+def create_backend(name, *args, **kwargs):
+    return get_backend(name)(*args, **kwargs)
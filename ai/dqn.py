@@ -0,0 +1,126 @@
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+import torch.optim as optim
+import copy
+import time
+from utils.metrics import LatencyTracker
+from ai.replay import ReplayBuffer
+
+# Everything here needs torch; load it through ai.backends so the game only
+# pays for the import when a DQN guard policy is selected.
+
+class DQN(nn.Module):
+    def __init__(self, input_dim, output_dim):
+        super(DQN, self).__init__()
+        self.fc1 = nn.Linear(input_dim, 128)
+        self.fc2 = nn.Linear(128, 128)
+        self.fc3 = nn.Linear(128, output_dim)
+        self.computation_times = LatencyTracker()  # Inference only; training passes aren't timed
+
+    def forward(self, x):
+        x = torch.relu(self.fc1(x))
+        x = torch.relu(self.fc2(x))
+        return self.fc3(x)
+
+    def act_batch(self, states):
+        """Greedy action indices for a (num_guards, input_dim) batch in one forward pass"""
+        start_time = time.perf_counter()
+        with torch.inference_mode():
+            q_values = self(torch.as_tensor(np.asarray(states), dtype=torch.float32))
+        actions = q_values.argmax(dim=1).numpy()
+        self.computation_times.record(time.perf_counter() - start_time)
+        return actions
+
+    def print_efficiency_metrics(self):
+        if len(self.computation_times):
+            avg_time = self.computation_times.get_average()
+            p99_time = self.computation_times.get_percentile(99)
+            print(f"Average Inference Time per Batch: {avg_time:.6f} seconds (p99 {p99_time:.6f})")
+        else:
+            print("No computation times recorded.")
+
+class DQNTrainer:
+    """DQN training with a target network, fed by a VecGuardEnv through a NumPy replay buffer"""
+    def __init__(self, model, env, buffer_capacity=100000, batch_size=64, gamma=0.99,
+                 learning_rate=1e-3, target_sync_interval=500, epsilon_start=1.0,
+                 epsilon_end=0.05, epsilon_decay_steps=10000, seed=None):
+        self.model = model
+        self.target_model = copy.deepcopy(model)
+        self.target_model.eval()
+        self.env = env
+        try:
+            # One fused kernel instead of a loop over every parameter tensor;
+            # older torch builds only fuse on CUDA
+            self.optimizer = optim.Adam(model.parameters(), lr=learning_rate, fused=True)
+        except (RuntimeError, TypeError):
+            self.optimizer = optim.Adam(model.parameters(), lr=learning_rate)
+        self.buffer = ReplayBuffer(buffer_capacity, state_dim=model.fc1.in_features,
+                                   batch_size=batch_size, seed=seed)
+        self.gamma = gamma
+        self.target_sync_interval = target_sync_interval
+        self.epsilon_start = epsilon_start
+        self.epsilon_end = epsilon_end
+        self.epsilon_decay_steps = epsilon_decay_steps
+        self.rng = np.random.default_rng(seed)
+        self.env_steps = 0
+        self.updates = 0
+        self.episodes = 0
+        self.features = None
+
+    @property
+    def epsilon(self):
+        progress = min(1.0, self.env_steps / self.epsilon_decay_steps)
+        return self.epsilon_start + progress * (self.epsilon_end - self.epsilon_start)
+
+    def collect(self, steps=1):
+        """Step every environment epsilon-greedily and store the transitions"""
+        if self.features is None:
+            self.env.reset()
+            self.features = self.env.get_features()
+        for _ in range(steps):
+            actions = self.model.act_batch(self.features)
+            explore = self.rng.random(self.env.num_envs) < self.epsilon
+            actions[explore] = self.rng.integers(0, len(self.env.action_space), explore.sum())
+
+            _, rewards, dones, info = self.env.step(actions)
+            # Bootstrap truncated episodes from their real last state, not the reset one
+            next_features = self.env.get_features(info["final_states"][:, :2])
+            self.buffer.add_batch(self.features, actions, rewards, next_features, dones)
+
+            self.features = self.env.get_features()
+            self.env_steps += 1
+            self.episodes += int((dones | info["truncated"]).sum())
+
+    def train_step(self):
+        """One gradient update on a replay minibatch; returns the loss"""
+        states, actions, rewards, next_states, dones = self.buffer.sample()
+        states, actions = torch.from_numpy(states), torch.from_numpy(actions)
+        rewards, next_states, dones = torch.from_numpy(rewards), torch.from_numpy(next_states), torch.from_numpy(dones)
+
+        q_values = self.model(states).gather(1, actions.unsqueeze(1)).squeeze(1)
+        with torch.no_grad():
+            next_values = self.target_model(next_states).max(dim=1).values
+            targets = rewards + self.gamma * (1 - dones) * next_values
+        loss = F.smooth_l1_loss(q_values, targets)
+
+        self.optimizer.zero_grad()
+        loss.backward()
+        self.optimizer.step()
+
+        self.updates += 1
+        if self.updates % self.target_sync_interval == 0:
+            self.target_model.load_state_dict(self.model.state_dict())
+        return loss.item()
+
+    def train(self, num_updates, updates_per_collect=4):
+        """Alternate environment steps and updates; returns the mean loss"""
+        losses = []
+        while len(self.buffer) < self.buffer.batch_size:
+            self.collect()
+        for i in range(num_updates):
+            if i % updates_per_collect == 0:
+                self.collect()
+            losses.append(self.train_step())
+        return sum(losses) / len(losses) if losses else 0
@@ -0,0 +1,200 @@
+from heapq import heapify, heappop, heappush
+import numpy as np
+
+INF = float('inf')
+
+class DStarLite:
+    """Incremental shortest paths from a guard to the moving player (Moving Target D* Lite).
+
+    The search is rooted at the guard's tile (D* Lite's goal) and answers for
+    the player's tile (its start), so a player move only shifts the key
+    offset km. When the guard steps to another tile, the part of the search
+    tree hanging below that tile is kept and everything else is dropped, so
+    the next search resumes from the edge of the kept subtree instead of
+    starting over. Tiles whose walkability changed on the NavGrid are repaired
+    in place. expansions counts the vertices (re)expanded by the last call.
+    """
+    def __init__(self):
+        self.nav_grid = None
+        self.expansions = 0
+        self.total_expansions = 0
+        self.resets = 0
+
+    def reset(self, nav_grid, goal, start):
+        self.nav_grid = nav_grid
+        self.walkable = nav_grid.walkable.copy()
+        self.version = nav_grid.version
+        self.goal = goal
+        self.start = start
+        self.km = 0
+        # g and rhs are offset by a constant when the root moves, so the kept
+        # subtree keeps its values; only differences between them matter
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.parent = {}  # Tile -> neighbour its rhs came from
+        self.adjacent = {}  # Tile -> its walkable neighbours, filled in as tiles are reached
+        self.queue = []
+        self.queued = {}  # Tile -> its current key; older heap entries are stale
+        self.push(goal)
+        self.resets += 1
+
+    @staticmethod
+    def heuristic(a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def calculate_key(self, s):
+        value = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (value + self.heuristic(self.start, s) + self.km, value)
+
+    def push(self, s):
+        key = self.calculate_key(s)
+        self.queued[s] = key
+        heappush(self.queue, (key, s))
+
+    def neighbors(self, s):
+        adjacent = self.adjacent.get(s)
+        if adjacent is None:
+            adjacent = self.adjacent[s] = tuple(self.nav_grid.neighbors(s))
+        return adjacent
+
+    def update_vertex(self, s):
+        if s != self.goal:
+            best, parent = INF, None
+            g = self.g
+            for neighbor in self.neighbors(s):
+                value = g.get(neighbor, INF)
+                if value < best:
+                    best, parent = value, neighbor
+            self.rhs[s] = best + 1
+            self.parent[s] = parent
+        if self.g.get(s, INF) != self.rhs.get(s, INF):
+            self.push(s)
+        else:
+            self.queued.pop(s, None)
+
+    def update_neighbors(self, s):
+        for neighbor in self.neighbors(s):
+            self.update_vertex(neighbor)
+
+    def compute_shortest_path(self):
+        g, rhs, queue, queued = self.g, self.rhs, self.queue, self.queued
+        start = self.start
+        expansions = 0
+        while queue:
+            key, s = queue[0]
+            if queued.get(s) != key:
+                heappop(queue)  # Superseded entry
+                continue
+            if key >= self.calculate_key(start) and rhs.get(start, INF) == g.get(start, INF):
+                break
+            heappop(queue)
+            new_key = self.calculate_key(s)
+            if key < new_key:
+                # Key went stale as km grew; requeue with the current one
+                queued[s] = new_key
+                heappush(queue, (new_key, s))
+                continue
+            del queued[s]
+            expansions += 1
+            if g.get(s, INF) > rhs.get(s, INF):
+                g[s] = rhs[s]
+                self.update_neighbors(s)
+            else:
+                g[s] = INF
+                self.update_vertex(s)
+                self.update_neighbors(s)
+        self.expansions += expansions
+        self.total_expansions += expansions
+
+    def move_goal(self, goal):
+        """Re-root the search at goal, keeping the subtree below it; False if it isn't in the tree"""
+        g, rhs, parent = self.g, self.rhs, self.parent
+        if g.get(goal, INF) == INF or g[goal] != rhs.get(goal):
+            return False
+
+        # Everything hanging below the old root but not below the new one is
+        # forgotten rather than repaired; children are found through the
+        # parent links, so this costs the size of the dropped part only
+        neighbors = self.neighbors
+        dropped = [self.goal]
+        seen = {self.goal, goal}
+        for s in dropped:
+            for child in neighbors(s):
+                if child not in seen and parent.get(child) == s:
+                    seen.add(child)
+                    dropped.append(child)
+        for s in dropped:
+            g.pop(s, None)
+            rhs.pop(s, None)
+            parent.pop(s, None)
+            self.queued.pop(s, None)
+        parent.pop(goal, None)
+        self.goal = goal
+
+        # Forgotten tiles bordering what is left form the new search frontier
+        for s in dropped:
+            if any(n in rhs for n in neighbors(s)):
+                self.update_vertex(s)
+        if len(self.queue) > 4 * len(self.queued) + 64:
+            # Compact the stale heap entries left behind
+            self.queue = [(key, s) for s, key in self.queued.items()]
+            heapify(self.queue)
+        return True
+
+    def apply_grid_changes(self):
+        """Repair the tiles whose walkability changed since the last replan"""
+        walkable = self.nav_grid.walkable
+        ys, xs = np.nonzero(walkable != self.walkable)
+        changed = list(zip(xs.tolist(), ys.tolist()))
+        for x, y in changed:
+            for tile in ((x, y), (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                self.adjacent.pop(tile, None)
+        for x, y in changed:
+            if not walkable[y, x]:
+                self.adjacent[(x, y)] = ()  # Blocked: nothing leads through it any more
+            self.update_vertex((x, y))
+            # Its grid neighbours, not its new adjacency: a tile that just got
+            # blocked has none, yet its neighbours' rhs may still route through it
+            for neighbor in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if self.nav_grid.is_walkable(*neighbor):
+                    self.update_vertex(neighbor)
+        self.walkable = walkable.copy()
+        self.version = self.nav_grid.version
+
+    def replan(self, nav_grid, guard_tile, player_tile):
+        """Bring the search up to date for the current guard and player tiles"""
+        self.expansions = 0
+        if nav_grid is not self.nav_grid:  # A new maze starts a new search
+            self.reset(nav_grid, guard_tile, player_tile)
+        else:
+            if player_tile != self.start:
+                self.km += self.heuristic(self.start, player_tile)
+                self.start = player_tile
+            if nav_grid.version != self.version:
+                self.apply_grid_changes()
+            if guard_tile != self.goal and not self.move_goal(guard_tile):
+                self.reset(nav_grid, guard_tile, player_tile)
+        self.compute_shortest_path()
+
+    def next_step(self, nav_grid, guard_tile, player_tile):
+        """Guard's next tile on a shortest path to the player, or None if there is none"""
+        self.expansions = 0
+        if guard_tile == player_tile or not nav_grid.same_component(guard_tile, player_tile):
+            return None
+        self.replan(nav_grid, guard_tile, player_tile)
+        path = self.path_to_player()
+        return path[0] if path else None
+
+    def path_to_player(self):
+        """Tiles from the guard's next step to the player, [] if the player can't be reached"""
+        g = self.g
+        if self.rhs.get(self.start, INF) == INF:
+            return []
+        # Follow steepest descent from the player down to the guard, then reverse
+        path = [self.start]
+        current = self.start
+        while current != self.goal:
+            current = min(self.neighbors(current), key=lambda n: g.get(n, INF))
+            path.append(current)
+        path.reverse()
+        return path[1:]
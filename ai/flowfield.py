@@ -0,0 +1,55 @@
+import random
+from utils.distance import bfs_distances
+
+class FlowField:
+    """BFS distance map from the player's tile that every guard can descend"""
+    def __init__(self):
+        self.nav_grid = None
+        self.version = None
+        self.target = None
+        self.distances = None
+        self.recomputes = 0
+
+    def update(self, nav_grid, target):
+        """Recompute the distance map only if the target tile or grid changed"""
+        if nav_grid is self.nav_grid and nav_grid.version == self.version and target == self.target:
+            return
+        self.nav_grid = nav_grid
+        self.version = nav_grid.version
+        self.target = target
+        self.distances = self.compute_distances(nav_grid, target)
+        self.recomputes += 1
+
+    @staticmethod
+    def compute_distances(nav_grid, target):
+        """Breadth-first distances to target, -1 where the target can't be reached"""
+        return bfs_distances(nav_grid, [target])
+
+    def distance_at(self, pos):
+        x, y = pos
+        if self.distances is None or not self.nav_grid.is_walkable(x, y):
+            return -1
+        return int(self.distances[y, x])
+
+    def next_step(self, pos, error_rate=0.0, personality=0.0):
+        """Neighbouring tile one step closer to the target, or None if there is none"""
+        distance = self.distance_at(pos)
+        if distance <= 0:
+            return None
+
+        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        if random.random() < personality:
+            random.shuffle(directions)
+
+        neighbours = []
+        for dx, dy in directions:
+            next_pos = (pos[0] + dx, pos[1] + dy)
+            next_distance = self.distance_at(next_pos)
+            if next_distance >= 0:
+                neighbours.append((next_distance, next_pos))
+
+        # Occasionally err and take any open step, uphill ones included;
+        # otherwise the steepest one (BFS neighbours differ by exactly 1)
+        if random.random() < error_rate:
+            return random.choice(neighbours)[1]
+        return min(neighbours, key=lambda c: c[0])[1]
@@ -1,6 +1,16 @@
 import numpy as np
 from collections import defaultdict
 import time
+from utils.metrics import LatencyTracker
+
+# State keys are ints: the low NEIGHBOURHOOD_BITS bits hold the 5x5 wall mask
+# around the guard, the rest hold guard_cell * 9 + player_direction
+NEIGHBOURHOOD_RADIUS = 2
+NEIGHBOURHOOD_BITS = (2 * NEIGHBOURHOOD_RADIUS + 1) ** 2
+DIRECTIONS = 9  # sign(dx), sign(dy) pairs
+# Mask bits of the 8 tiles right around the guard, for tables that must work on any maze
+RING_BITS = [(dy + NEIGHBOURHOOD_RADIUS) * (2 * NEIGHBOURHOOD_RADIUS + 1) + dx + NEIGHBOURHOOD_RADIUS
+             for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dx, dy) != (0, 0)]
 
 class QLearning:
     def __init__(self, learning_rate=0.1, discount_factor=0.95, exploration_rate=0.1):
@@ -8,30 +18,26 @@ class QLearning:
         self.lr = learning_rate
         self.gamma = discount_factor
         self.epsilon = exploration_rate
-        self.computation_times = []
+        self.computation_times = LatencyTracker()  # Bounded, unlike a per-call list
 
-    def get_state(self, guard_pos, player_pos, walls):
-        """Convert current game state to a hashable state representation"""
+    def get_state(self, guard_pos, player_pos, nav_grid):
+        """Encode the guard's view of the game as a small int state key"""
         visibility_radius = 5  # Guard can only see 5 tiles around
-        relative_x = player_pos[0] - guard_pos[0]
-        relative_y = player_pos[1] - guard_pos[1]
-        
-        # If player is within visibility radius, include their position
+        guard_x, guard_y = int(guard_pos[0]), int(guard_pos[1])
+        relative_x = player_pos[0] - guard_x
+        relative_y = player_pos[1] - guard_y
+
+        # If player is within visibility radius, include their direction (4 = not visible)
         if abs(relative_x) <= visibility_radius and abs(relative_y) <= visibility_radius:
-            player_direction = (
-                np.sign(relative_x),
-                np.sign(relative_y)
-            )
+            player_direction = (np.sign(relative_x) + 1) * 3 + np.sign(relative_y) + 1
         else:
-            player_direction = (0, 0)  # Player not visible
+            player_direction = 4
 
-        # Include nearby walls in state
-        nearby_walls = tuple(
-            (x, y) for x, y in walls 
-            if abs(x - guard_pos[0]) <= 2 and abs(y - guard_pos[1]) <= 2
-        )
+        # Include nearby walls in state, read from the grid's precomputed masks
+        nearby_walls = int(nav_grid.wall_masks(NEIGHBOURHOOD_RADIUS)[guard_y, guard_x])
+        guard_cell = guard_y * nav_grid.width + guard_x
 
-        return (guard_pos, player_direction, nearby_walls)
+        return ((guard_cell * DIRECTIONS + int(player_direction)) << NEIGHBOURHOOD_BITS) | nearby_walls
 
     def get_action(self, state):
         """Choose action using epsilon-greedy policy"""
@@ -51,7 +57,7 @@ class QLearning:
             reward + self.gamma * best_next_value - current_q
         )
         end_time = time.time()
-        self.computation_times.append(end_time - start_time)
+        self.computation_times.record(end_time - start_time)
 
     def get_reward(self, old_distance, new_distance, found_player=False):
         """Calculate reward based on whether guard got closer to player"""
@@ -71,8 +77,104 @@ class QLearning:
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
     def print_efficiency_metrics(self):
-        if self.computation_times:
-            avg_time = sum(self.computation_times) / len(self.computation_times)
-            print(f"Average Computation Time per Q-Learning Update: {avg_time:.6f} seconds")
+        if len(self.computation_times):
+            avg_time = self.computation_times.get_average()
+            p99_time = self.computation_times.get_percentile(99)
+            print(f"Average Computation Time per Q-Learning Update: {avg_time:.6f} seconds (p99 {p99_time:.6f})")
         else:
             print("No computation times recorded.")
+
+class DenseQLearning(QLearning):
+    """QLearning backed by a dense (num_states, 4) NumPy array instead of nested dicts.
+
+    By default rows are indexed by the state key without its wall-mask bits
+    (guard cell and player direction), which is lossless on a fixed maze. With
+    local=True they are indexed by the walls on the 8 tiles around the guard
+    and the player direction instead, which means the same thing on every
+    maze (LOCAL_STATES rows; the full 5x5 mask would need 2 ** 24 times more).
+    Actions may be given as names or as indices into ACTIONS.
+    """
+    ACTIONS = ['up', 'down', 'left', 'right']
+    LOCAL_STATES = 2 ** len(RING_BITS) * DIRECTIONS
+
+    def __init__(self, num_states=None, learning_rate=0.1, discount_factor=0.95, exploration_rate=0.1,
+                 q_table=None, seed=None, local=False):
+        super().__init__(learning_rate, discount_factor, exploration_rate)
+        self.local = local
+        if q_table is None:
+            if num_states is None and local:
+                num_states = self.LOCAL_STATES
+            q_table = np.zeros((num_states, len(self.ACTIONS)), dtype=np.float32)
+        self.q_table = q_table
+        self.action_index = {action: i for i, action in enumerate(self.ACTIONS)}
+        self.rng = np.random.default_rng(seed)
+
+    def state_index(self, state):
+        """Table row of a state key, or of an int64 array of them"""
+        if not self.local:
+            return state >> NEIGHBOURHOOD_BITS
+        ring = 0
+        for i, bit in enumerate(RING_BITS):
+            ring |= ((state >> bit) & 1) << i
+        return ring * DIRECTIONS + (state >> NEIGHBOURHOOD_BITS) % DIRECTIONS
+
+    def _action_indices(self, actions):
+        if isinstance(actions, str):
+            return self.action_index[actions]
+        actions = np.asarray(actions)
+        if actions.dtype.kind in 'US':
+            return np.array([self.action_index[a] for a in actions.tolist()])
+        return actions
+
+    def get_action(self, state):
+        """Choose action using epsilon-greedy policy"""
+        q_values = self.q_table[self.state_index(state)]
+        if self.rng.random() < self.epsilon or not q_values.any():
+            return self.ACTIONS[self.rng.integers(len(self.ACTIONS))]
+        return self.ACTIONS[int(q_values.argmax())]
+
+    def get_actions(self, states):
+        """Epsilon-greedy action indices for a batch of state keys"""
+        q_values = self.q_table[self.state_index(np.asarray(states, dtype=np.int64))]
+        actions = q_values.argmax(axis=1)
+        explore = (self.rng.random(len(actions)) < self.epsilon) | ~q_values.any(axis=1)
+        actions[explore] = self.rng.integers(0, len(self.ACTIONS), explore.sum())
+        return actions
+
+    def update(self, state, action, reward, next_state):
+        """Update Q-value for state-action pair"""
+        start_time = time.time()
+        row = self.state_index(state)
+        column = self._action_indices(action)
+        best_next_value = self.q_table[self.state_index(next_state)].max()
+        current_q = self.q_table[row, column]
+        self.q_table[row, column] = current_q + self.lr * (reward + self.gamma * best_next_value - current_q)
+        end_time = time.time()
+        self.computation_times.record(end_time - start_time)
+
+    def update_batch(self, states, actions, rewards, next_states):
+        """Apply a batch of Q-learning updates.
+
+        Every target is computed from the table as it was before the batch, so
+        a (state, action) pair that occurs several times moves once, towards
+        the mean of its targets, rather than once per occurrence.
+        """
+        start_time = time.time()
+        rows = self.state_index(np.asarray(states, dtype=np.int64))
+        columns = self._action_indices(actions)
+        best_next_values = self.q_table[self.state_index(np.asarray(next_states, dtype=np.int64))].max(axis=1)
+        targets = np.asarray(rewards, dtype=np.float64) + self.gamma * best_next_values
+        pairs, inverse = np.unique(rows * len(self.ACTIONS) + columns, return_inverse=True)
+        mean_targets = np.bincount(inverse, weights=targets) / np.bincount(inverse)
+        rows, columns = np.divmod(pairs, len(self.ACTIONS))
+        self.q_table[rows, columns] += self.lr * (mean_targets - self.q_table[rows, columns])
+        end_time = time.time()
+        self.computation_times.record(end_time - start_time)
+
+    def save(self, path):
+        np.save(path, self.q_table)
+
+    @classmethod
+    def load(cls, path, mmap=True, **kwargs):
+        """Load a saved table. With mmap the table is shared read-only, so it can act but not update"""
+        return cls(q_table=np.load(path, mmap_mode='r' if mmap else None), **kwargs)
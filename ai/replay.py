@@ -0,0 +1,70 @@
+import numpy as np
+
+class ReplayBuffer:
+    """Fixed-capacity experience replay on preallocated NumPy arrays.
+
+    Inserting overwrites the oldest transition in O(1). sample() gathers into
+    batch arrays that are allocated once and reused, so the returned arrays
+    are only valid until the next call.
+    """
+    def __init__(self, capacity, state_dim, batch_size=64, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self.position = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+        self._allocate_batch(batch_size)
+
+    def _allocate_batch(self, batch_size):
+        self.batch_size = batch_size
+        self.batch_indices = np.zeros(batch_size, dtype=np.int64)
+        self._uniform = np.zeros(batch_size)
+        self.batch = (
+            np.zeros((batch_size, self.states.shape[1]), dtype=np.float32),
+            np.zeros(batch_size, dtype=np.int64),
+            np.zeros(batch_size, dtype=np.float32),
+            np.zeros((batch_size, self.states.shape[1]), dtype=np.float32),
+            np.zeros(batch_size, dtype=np.float32),
+        )
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done):
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """Insert one transition per row, e.g. a VecGuardEnv step"""
+        count = len(actions)
+        indices = (self.position + np.arange(count)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+        self.position = int((self.position + count) % self.capacity)
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size=None):
+        """Uniform random minibatch of (states, actions, rewards, next_states, dones)"""
+        if batch_size is not None and batch_size != self.batch_size:
+            self._allocate_batch(batch_size)
+        # Scale uniforms in place and truncate into the index buffer: no per-call allocation
+        self.rng.random(out=self._uniform)
+        self._uniform *= self.size
+        self.batch_indices[:] = self._uniform
+        sources = (self.states, self.actions, self.rewards, self.next_states, self.dones)
+        for source, out in zip(sources, self.batch):
+            np.take(source, self.batch_indices, axis=0, out=out)
+        return self.batch
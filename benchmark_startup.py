@@ -0,0 +1,61 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from config.settings import GUARD_NAVIGATION
+
+# Cold-start benchmark: time from launching `python main.py` to its first menu
+# frame. main.py exits right after that frame when
+# MISSION804_EXIT_AFTER_FIRST_FRAME is set and reports whether torch was imported.
+
+def time_startup(env):
+    """Seconds from process start to the first menu frame, and whether torch was loaded"""
+    start_time = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], env=env, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    for line in process.stdout:
+        if line.startswith("First menu frame"):
+            elapsed = time.perf_counter() - start_time
+            process.wait()
+            return elapsed, "torch loaded: True" in line
+    process.wait()
+    raise RuntimeError(f"main.py exited with code {process.returncode} before drawing the menu")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure time from process start to the first menu frame")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="Exit with status 1 if the median startup time exceeds this")
+    parser.add_argument("--headless", action="store_true", help="Use SDL's dummy video and audio drivers")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, MISSION804_EXIT_AFTER_FIRST_FRAME="1")
+    if args.headless:
+        env.update(SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+
+    times = []
+    torch_loaded = False
+    for _ in range(args.runs):
+        elapsed, loaded = time_startup(env)
+        times.append(elapsed)
+        torch_loaded = torch_loaded or loaded
+
+    median = statistics.median(times)
+    print(f"Startup to first menu frame over {args.runs} runs: "
+          f"median {median:.3f}s, min {min(times):.3f}s, max {max(times):.3f}s")
+    print(f"Guard navigation: {GUARD_NAVIGATION}, torch loaded: {torch_loaded}")
+
+    failed = False
+    if torch_loaded and GUARD_NAVIGATION != "dqn":
+        print("Regression: torch was imported although no DQN guard policy is selected")
+        failed = True
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"Regression: median startup {median:.3f}s exceeds {args.max_seconds:.3f}s")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
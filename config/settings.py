@@ -3,3 +3,22 @@ SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 FPS = 60
 TITLE = "Mission 804"
+
+# The game rules advance in fixed ticks, TICK_RATE per second whatever the
+# frame rate; frames in between are drawn interpolated. A slow frame runs the
+# ticks it missed before drawing again, at most MAX_CATCH_UP_TICKS of them,
+# after which the game slows down rather than falling further behind
+TICK_RATE = 30
+MAX_CATCH_UP_TICKS = 5
+
+# Guard navigation: "astar" plans a path per guard, "flowfield" shares one
+# distance map from the player's tile across all guards, "dstar" keeps a D* Lite
+# search per guard and repairs it as the player moves, "dqn" scores every
+# guard with one batched DQN forward pass per tick, "policy" defers every step
+# to GuardManager.guard_policy (used by train_guards.py)
+GUARD_NAVIGATION = "astar"
+
+# Pathfinding engine for uniform-cost grids: "astar", "bidirectional" or "jps".
+# All engines return equally short paths; the alternatives expand far fewer
+# nodes on large mazes
+PATHFINDING_ENGINE = "astar"
@@ -1,32 +1,73 @@
-import pygame
 import random
 import math
-from ai.agents import GuardAgent
+import numpy as np
+from ai.agents import GuardAgent, encode_guard_features
+from ai.flowfield import FlowField
+from utils.pathfinding import get_pathfinder
+from interface.sprites import SpriteAtlas
+from interface.assets import assets
+from utils.sampling import sample_spaced
 
 class GuardManager:
-    def __init__(self, tile_size, guard_speed):
+    """Guards stored as parallel NumPy arrays, one row per guard.
+
+    positions holds (x, y) in tiles, targets the waypoint each guard is
+    walking to. Paths stay per-guard lists that are never popped: path_cursors
+    indexes the current waypoint and a guard needs a new path once its cursor
+    reaches path_lengths. Movement, arrival and wall checks in update() run on
+    every guard at once; only guards that need a new path or just reached a
+    waypoint are visited one by one.
+    """
+    def __init__(self, tile_size, guard_speed, navigation="astar", pathfinding_engine="astar"):
         self.tile_size = tile_size
         self.guard_speed = guard_speed
-        self.guards = []
+        self.navigation = navigation  # "astar" (per-guard paths), "flowfield" (shared), "dstar", "dqn" or "policy"
+        self.policy_network = None  # DQN scoring every guard at once in "dqn" mode
+        # In "policy" mode: callable (guard_index, tile, player_pos, nav_grid) -> next tile or None
+        self.guard_policy = None
+        # Guards keep their own noisy A* unless a faster engine is selected
+        self.pathfinder = None if pathfinding_engine == "astar" else get_pathfinder(pathfinding_engine)
+        self.flow_field = FlowField()
+        self.nodes_expanded = 0  # Vertices (re)expanded by the guards' D* Lite searches on the last tick
+        self.path_update_interval = 30  # Ticks of wandering before guards target the player directly
+        # Full path searches allowed per tick; guards over the budget wait for the next one
+        self.search_budget = 8
+        self.searches_left = 0
+        self.search_refused = False
+        self.plan_start = 0  # First guard refused a search last tick; planning resumes there
+        self.spatial_index = None  # Optional SpatialHash that tracks the tile of every guard
         self.guard_agents = []
-        self.load_images()
+        self.allocate(0)
+        self.sprites = None  # Built on the first draw, so headless runs never load images
+
+    def __len__(self):
+        return len(self.guard_agents)
+
+    def allocate(self, count):
+        self.positions = np.zeros((count, 2))
+        self.previous_positions = np.zeros((count, 2))  # Positions before the last update, for interpolation
+        self.velocities = np.zeros((count, 2))  # Tiles moved on the last tick
+        self.targets = np.zeros((count, 2))
+        self.tiles = np.zeros((count, 2), dtype=np.int64)  # Tile each guard is indexed under
+        self.facing_left = np.zeros(count, dtype=bool)
+        self.moving = np.zeros(count, dtype=bool)
+        self.frames = np.zeros(count, dtype=np.int64)  # Animation counters, advanced on every tick spent moving
+        self.update_timers = np.zeros(count, dtype=np.int64)
+        self.paths = [[] for _ in range(count)]
+        self.path_cursors = np.zeros(count, dtype=np.int64)
+        self.path_lengths = np.zeros(count, dtype=np.int64)
 
     def load_images(self):
-        self.guard_idle = pygame.transform.scale(
-            pygame.image.load("assets/images/copidle.png"), 
-            (self.tile_size, self.tile_size)
-        )
-        self.guard_run1 = pygame.transform.scale(
-            pygame.image.load("assets/images/coprun1.png"), 
-            (self.tile_size, self.tile_size)
-        )
-        self.guard_run2 = pygame.transform.scale(
-            pygame.image.load("assets/images/coprun2.png"), 
-            (self.tile_size, self.tile_size)
-        )
+        size = (self.tile_size, self.tile_size)
+        self.guard_idle = assets.image("copidle.png", size)
+        self.guard_run1 = assets.image("coprun1.png", size)
+        self.guard_run2 = assets.image("coprun2.png", size)
+        # The source frames face left; the atlas holds both facings
+        self.sprites = SpriteAtlas()
+        self.sprites.add("guard", "idle", [self.guard_idle], faces_right=False)
+        self.sprites.add("guard", "run", [self.guard_run1, self.guard_run2], faces_right=False)
 
     def place_guards(self, empty_cells, maze, num_guards):
-        self.guards = []
         self.guard_agents = []
         maze_size = (len(maze[0]), len(maze))
         
@@ -34,97 +75,167 @@ class GuardManager:
         min_distance = 10  # Minimum 10 tiles away from start
         start_pos = (1, 1)  # Player starting position
         
-        # Filter cells that are far enough from start
-        safe_cells = [
-            (x, y) for x, y in empty_cells 
-            if abs(x - start_pos[0]) + abs(y - start_pos[1]) >= min_distance
-        ]
-        
+        # Draw from cells that are far enough from start
+        def far_enough(pos):
+            return abs(pos[0] - start_pos[0]) + abs(pos[1] - start_pos[1]) >= min_distance
+        chosen = sample_spaced(empty_cells, num_guards, spacing=1, accept=far_enough)
+
         # If we don't have enough safe cells, use cells that are as far as possible
-        if len(safe_cells) < num_guards:
+        if len(chosen) < num_guards:
             # Sort cells by distance from start
             empty_cells.sort(
                 key=lambda pos: -(abs(pos[0] - start_pos[0]) + abs(pos[1] - start_pos[1]))
             )
-            safe_cells = empty_cells[:num_guards]
-        
-        for _ in range(num_guards):
-            if safe_cells:
-                x, y = random.choice(safe_cells)
-                guard = {
-                    "pos": (x, y),
-                    "facing_left": False,
-                    "current_path": [],
-                    "target_pos": None
-                }
-                self.guards.append(guard)
-                self.guard_agents.append(GuardAgent((x, y), maze_size))
-                safe_cells.remove((x, y))
-                empty_cells.remove((x, y))
-                print(f"Placed guard at ({x}, {y})")
-        
-        return empty_cells
-
-    def update(self, maze, player_pos, obstacles, doors):
-        walls = [(x, y) for y, row in enumerate(maze) 
-                for x, cell in enumerate(row) if cell == 1]
-
-        for guard, agent in zip(self.guards, self.guard_agents):
-            curr_x, curr_y = guard["pos"]
-            
-            # Introduce a delay before guards start targeting the player directly
-            if agent.update_timer < agent.path_update_interval:
-                agent.update_timer += 1
-                if not guard["current_path"]:
-                    # Random initial target within the maze
-                    random_target = (random.randint(0, len(maze[0]) - 1), random.randint(0, len(maze) - 1))
-                    guard["current_path"] = agent.find_path_to_player(
-                        (int(curr_x), int(curr_y)),
-                        random_target,
-                        walls
-                    )
-            else:
-                # Get path to player if needed
-                if not guard["current_path"]:
-                    guard["current_path"] = agent.find_path_to_player(
-                        (int(curr_x), int(curr_y)),
-                        player_pos,
-                        walls
-                    )
-
-            # Move along path
-            if guard["current_path"] and guard["current_path"]:
-                next_x, next_y = guard["current_path"][0]
-                
-                # Calculate movement direction
-                dx = next_x - curr_x
-                dy = next_y - curr_y
-                
-                # Update facing direction
-                if dx != 0:
-                    guard["facing_left"] = dx < 0
-
-                # Move if not blocked by wall
-                new_x = curr_x + (self.guard_speed if dx > 0 else -self.guard_speed if dx < 0 else 0)
-                new_y = curr_y + (self.guard_speed if dy > 0 else -self.guard_speed if dy < 0 else 0)
-                
-                # Check if reached next path point
-                if abs(new_x - next_x) < self.guard_speed and abs(new_y - next_y) < self.guard_speed:
-                    guard["pos"] = (next_x, next_y)
-                    guard["current_path"].pop(0)
-                else:
-                    # Check wall collision before moving
-                    new_tile_x = int(new_x)
-                    new_tile_y = int(new_y)
-                    if (new_tile_x, new_tile_y) not in walls:
-                        guard["pos"] = (new_x, new_y)
-                    else:
-                        # Path is blocked, recalculate
-                        guard["current_path"] = []
-
-    def draw(self, screen):
-        for guard in self.guards:
-            x, y = guard["pos"]
-            guard_img = self.guard_idle if guard["facing_left"] else \
-                       pygame.transform.flip(self.guard_idle, True, False)
-            screen.blit(guard_img, (int(x * self.tile_size), int(y * self.tile_size)))
+            chosen = sample_spaced(empty_cells[:num_guards], num_guards, spacing=1)
+
+        self.allocate(len(chosen))
+        for i, (x, y) in enumerate(chosen):
+            self.positions[i] = (x, y)
+            self.tiles[i] = (x, y)
+            self.guard_agents.append(GuardAgent((x, y), maze_size, self.pathfinder))
+            print(f"Placed guard at ({x}, {y})")
+
+        self.previous_positions = self.positions.copy()
+
+        # Drop the guard tiles in one pass rather than a list.remove per guard
+        occupied = set(chosen)
+        return [cell for cell in empty_cells if cell not in occupied]
+
+    def set_path(self, i, path):
+        self.paths[i] = path
+        self.path_cursors[i] = 0
+        self.path_lengths[i] = len(path)
+        if path:
+            self.targets[i] = path[0]
+
+    def spend_search(self):
+        """Take one full path search from this tick's budget; False once it is spent"""
+        if self.searches_left == 0:
+            self.search_refused = True
+            return False
+        self.searches_left -= 1
+        return True
+
+    def plan(self, i, tile, warming_up, player_pos, nav_grid, policy_actions):
+        """New path for a guard that has run out of waypoints"""
+        agent = self.guard_agents[i]
+        if self.navigation == "policy":
+            # An external policy (e.g. a learner in training) picks every step
+            next_pos = self.guard_policy(i, tile, player_pos, nav_grid)
+            return [next_pos] if next_pos else []
+        # Introduce a delay before guards start targeting the player directly
+        if warming_up:
+            if self.navigation == "flowfield":
+                # A random walk; searching per guard is what the shared field avoids
+                return agent.wander(tile, nav_grid)
+            if not self.spend_search():
+                return []
+            # Random initial target within the maze
+            random_target = (random.randint(0, nav_grid.width - 1), random.randint(0, nav_grid.height - 1))
+            return agent.find_path_to_player(tile, random_target, nav_grid)
+
+        path = []
+        if self.navigation == "flowfield":
+            path = agent.follow_flow_field(tile, self.flow_field)
+        # Standing on the player's tile, or cut off from it, costs the planners
+        # nothing, so only a real search is budgeted
+        searchable = tile != player_pos
+        if (not path and self.navigation == "dstar" and searchable
+                and nav_grid.same_component(tile, player_pos) and self.spend_search()):
+            # Repairs last tick's search instead of planning from scratch
+            path = agent.follow_incremental_plan(tile, player_pos, nav_grid)
+            self.nodes_expanded += agent.planner.expansions
+        if not path and policy_actions is not None:
+            path = agent.follow_policy_action(tile, policy_actions[i], nav_grid)
+        if not path and searchable and self.spend_search():
+            path = agent.find_path_to_player(tile, player_pos, nav_grid)
+        return path
+
+    def update(self, nav_grid, player_pos, obstacles, doors):
+        self.nodes_expanded = 0
+        self.previous_positions = self.positions.copy()
+        if not self.guard_agents:
+            return
+        tiles = self.positions.astype(np.int64)
+        policy_actions = None
+        if self.navigation == "dqn" and self.policy_network is not None:
+            # A single batched forward pass per tick covers every guard
+            policy_actions = self.policy_network.act_batch(
+                encode_guard_features(tiles, player_pos, nav_grid)
+            )
+
+        warming_up = np.zeros(len(self), dtype=bool)
+        if self.navigation != "policy":
+            warming_up = self.update_timers < self.path_update_interval
+            self.update_timers[warming_up] += 1
+        if self.navigation == "flowfield" and not warming_up.all():
+            # One distance map shared by every guard, rebuilt only when the player changes
+            # tiles; wandering guards don't read it, so it waits until one stops wandering
+            self.flow_field.update(nav_grid, player_pos)
+
+        # Plan only for the guards whose path has run out, starting with the
+        # first one that was left waiting for a search last tick
+        planning = np.flatnonzero(self.path_cursors >= self.path_lengths)
+        planning = np.roll(planning, -int(np.searchsorted(planning, self.plan_start)))
+        self.searches_left = self.search_budget
+        first_refused = None
+        for i in planning.tolist():
+            tile = (int(tiles[i, 0]), int(tiles[i, 1]))
+            self.search_refused = False
+            self.set_path(i, self.plan(i, tile, warming_up[i], player_pos, nav_grid, policy_actions))
+            if self.search_refused and first_refused is None:
+                first_refused = i
+        self.plan_start = 0 if first_refused is None else first_refused
+
+        # Move every guard with a waypoint one step towards it
+        active = self.path_cursors < self.path_lengths
+        self.moving = active
+        self.frames[active] += 1
+        delta = self.targets - self.positions
+        self.velocities = np.where(active[:, None], np.sign(delta) * self.guard_speed, 0.0)
+        turned = active & (delta[:, 0] != 0)
+        self.facing_left[turned] = delta[turned, 0] < 0
+        new_positions = self.positions + self.velocities
+
+        # Guards that reach their waypoint snap onto it and advance their cursor
+        arrived = active & (np.abs(new_positions - self.targets) < self.guard_speed).all(axis=1)
+        self.positions[arrived] = self.targets[arrived]
+        self.path_cursors[arrived] += 1
+        for i in np.flatnonzero(arrived & (self.path_cursors < self.path_lengths)).tolist():
+            self.targets[i] = self.paths[i][self.path_cursors[i]]
+
+        # The rest move unless that would take them into a wall
+        stepping = active & ~arrived
+        new_tiles = new_positions.astype(np.int64)
+        blocked = stepping & (nav_grid.walkable[new_tiles[:, 1], new_tiles[:, 0]] == 0)
+        stepping &= ~blocked
+        self.positions[stepping] = new_positions[stepping]
+        # Path is blocked, recalculate
+        self.path_lengths[blocked] = 0
+        self.velocities[blocked] = 0
+
+        # Re-bucket only the guards that crossed into another tile
+        tiles = self.positions.astype(np.int64)
+        if self.spatial_index is not None:
+            for i in np.flatnonzero((tiles != self.tiles).any(axis=1)).tolist():
+                self.spatial_index.move("guard", i, (int(tiles[i, 0]), int(tiles[i, 1])))
+        self.tiles = tiles
+
+    def draw(self, screen, alpha=1.0):
+        """Blit every guard and return the screen rects they cover.
+
+        alpha blends from the positions before the last update (0) to the
+        current ones (1), for frames drawn between two simulation ticks.
+        """
+        if self.sprites is None:
+            self.load_images()
+        positions = self.positions
+        if alpha < 1.0:
+            positions = self.previous_positions + (positions - self.previous_positions) * alpha
+        rects = []
+        for (x, y), moving, frame, facing_left in zip(positions.tolist(), self.moving.tolist(),
+                                                      self.frames.tolist(), self.facing_left.tolist()):
+            state = "run" if moving else "idle"
+            guard_img = self.sprites.get("guard", state, frame // 10, not facing_left)
+            rects.append(screen.blit(guard_img, (int(x * self.tile_size), int(y * self.tile_size))))
+        return rects
@@ -1,32 +1,25 @@
-import pygame
 import random
 from collections import deque
+from interface.assets import assets
+from utils.distance import manhattan_distances
+from utils.pathfinding import k_shortest_paths
 
 class ItemManager:
     def __init__(self, tile_size):
         self.tile_size = tile_size
-        self.doors = []
-        self.keys = []
-        self.player_keys = 0
-        self.load_images()
+        self.doors = {}  # (x, y) -> locked
+        self.keys = set()  # (x, y) of every key still on the floor
+        self.images_loaded = False  # Loaded on the first draw
 
     def load_images(self):
-        self.door_locked_img = pygame.transform.scale(
-            pygame.image.load("assets/images/celldoor.png"), 
-            (self.tile_size, self.tile_size)
-        )
-        self.door_unlocked_img = pygame.transform.scale(
-            pygame.image.load("assets/images/doorholder.png"), 
-            (self.tile_size, self.tile_size)
-        )
-        self.key_img = pygame.transform.scale(
-            pygame.image.load("assets/images/keyblue.png"), 
-            (self.tile_size, self.tile_size)
-        )
+        size = (self.tile_size, self.tile_size)
+        self.door_locked_img = assets.image("celldoor.png", size)
+        self.door_unlocked_img = assets.image("doorholder.png", size)
+        self.key_img = assets.image("keyblue.png", size)
+        self.images_loaded = True
 
-    def find_player_region(self, maze, start_pos, distance=5):
+    def find_player_region(self, nav_grid, start_pos, distance=5):
         """Find cells within player's initial region using BFS"""
-        rows, cols = len(maze), len(maze[0])
         visited = set()
         queue = deque([(start_pos)])
         player_region = set()
@@ -39,33 +32,15 @@ class ItemManager:
                     player_region.add((x, y))
                     for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
                         nx, ny = x + dx, y + dy
-                        if (0 <= nx < cols and 0 <= ny < rows and 
-                            maze[ny][nx] == 0 and 
-                            (nx, ny) not in visited):
+                        if nav_grid.is_walkable(nx, ny) and (nx, ny) not in visited:
                             queue.append((nx, ny))
         return player_region
 
-    def find_optimal_paths(self, maze, start, end, pathfinding_func):
-        """Find multiple optimal and near-optimal paths using the provided pathfinding function"""
-        base_path = pathfinding_func(start, end, maze)
-        paths = [base_path]
-        
-        # Create temporary maze copies to find alternative paths
-        temp_maze = [row[:] for row in maze]
-        for _ in range(2):  # Find 2 alternative paths
-            if not base_path:
-                break
-            # Block a random point in the previous path to force an alternative
-            if len(base_path) > 2:  # Avoid blocking start/end points
-                block_point = random.choice(base_path[1:-1])
-                temp_maze[block_point[1]][block_point[0]] = 1
-                alt_path = pathfinding_func(start, end, temp_maze)
-                if alt_path:
-                    paths.append(alt_path)
-        
-        return paths
+    def find_optimal_paths(self, nav_grid, start, end, num_paths=3):
+        """The shortest path and the next best distinct alternatives, shortest first"""
+        return [path for _, path in k_shortest_paths(nav_grid, start, end, num_paths)]
 
-    def find_door_locations(self, paths, player_region, num_doors=3):
+    def find_door_locations(self, nav_grid, paths, player_region, num_doors=3):
         """Find strategic door locations along paths outside player region"""
         door_locations = []
         all_path_points = set()
@@ -76,7 +51,8 @@ class ItemManager:
         candidate_points = [p for p in all_path_points if p not in player_region]
         
         # Sort by distance from player region for better distribution
-        candidate_points.sort(key=lambda p: min(self.manhattan_distance(p, pr) for pr in player_region))
+        region_distance = manhattan_distances((nav_grid.height, nav_grid.width), player_region)
+        candidate_points.sort(key=lambda p: region_distance[p[1], p[0]])
         
         # Select door locations ensuring minimum spacing
         min_spacing = 4  # Minimum tiles between doors
@@ -88,16 +64,17 @@ class ItemManager:
         
         return door_locations
 
-    def find_key_locations(self, maze, player_region, door_locations, num_keys):
+    def find_key_locations(self, nav_grid, player_region, door_locations, num_keys):
         """Place keys strategically - at least one somewhat close to player"""
         key_locations = []
-        empty_cells = [(x, y) for y in range(len(maze)) for x in range(len(maze[0])) 
-                      if maze[y][x] == 0 and (x, y) not in door_locations]
+        empty_cells = [(x, y) for y in range(nav_grid.height) for x in range(nav_grid.width) 
+                      if nav_grid.is_walkable(x, y) and (x, y) not in door_locations]
         
         # Find cells just outside player region for first key
+        shape = (nav_grid.height, nav_grid.width)
+        region_distance = manhattan_distances(shape, player_region)
         border_cells = [cell for cell in empty_cells if
-                       cell not in player_region and
-                       any(self.manhattan_distance(cell, pr) <= 3 for pr in player_region)]
+                       cell not in player_region and region_distance[cell[1], cell[0]] <= 3]
         
         if border_cells:
             # Place first key in accessible location near player region
@@ -106,8 +83,8 @@ class ItemManager:
             empty_cells.remove(first_key)
         
         # Place remaining keys
-        cells_by_distance = sorted(empty_cells, 
-                                 key=lambda c: min(self.manhattan_distance(c, d) for d in door_locations))
+        door_distance = manhattan_distances(shape, door_locations)
+        cells_by_distance = sorted(empty_cells, key=lambda c: door_distance[c[1], c[0]])
         
         for _ in range(num_keys - 1):
             if cells_by_distance:
@@ -123,21 +100,21 @@ class ItemManager:
     def manhattan_distance(self, pos1, pos2):
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
-    def place_doors_and_keys(self, maze, start, exit_tile, num_guards, empty_cells, pathfinding_func):
+    def place_doors_and_keys(self, nav_grid, start, exit_tile, num_guards, empty_cells):
         """Enhanced door and key placement with improved distribution"""
         # Find player's initial region
-        player_region = self.find_player_region(maze, start, distance=10)  # Ensure safe spot around player
+        player_region = self.find_player_region(nav_grid, start, distance=10)  # Ensure safe spot around player
         
         # Find optimal paths
-        optimal_paths = self.find_optimal_paths(maze, start, exit_tile, pathfinding_func)
+        optimal_paths = self.find_optimal_paths(nav_grid, start, exit_tile)
         
         # Place doors strategically
         num_doors = min(3, len(empty_cells) // 10)  # Scale doors with maze size
-        door_locations = self.find_door_locations(optimal_paths, player_region, num_doors)
-        self.doors = [(x, y, True) for x, y in door_locations]  # All doors start locked
+        door_locations = self.find_door_locations(nav_grid, optimal_paths, player_region, num_doors)
+        self.doors = {(x, y): True for x, y in door_locations}  # All doors start locked
         
         # Place keys strategically
-        key_locations = self.find_key_locations(maze, player_region, door_locations, num_doors)
+        key_locations = self.find_key_locations(nav_grid, player_region, door_locations, num_doors)
         
         # Ensure at least 2 keys are inside the safe spot
         keys_in_safe_spot = [key for key in key_locations if key in player_region]
@@ -150,7 +127,7 @@ class ItemManager:
                     key_locations.append(new_key)
                     available_safe_spot_cells.remove(new_key)
         
-        self.keys = key_locations
+        self.keys = set(key_locations)
         
         # Update empty cells
         used_cells = set(door_locations + key_locations)
@@ -159,23 +136,27 @@ class ItemManager:
         return empty_cells
 
     def collect_key(self, x, y):
-        for kx, ky in self.keys:
-            if (x, y) == (kx, ky):
-                self.keys.remove((kx, ky))
-                self.player_keys += 1
-                return True
-        return False
+        """Pick up the key on (x, y); returns False if there is none"""
+        if (x, y) not in self.keys:
+            return False
+        self.keys.remove((x, y))
+        return True
+
+    def is_door_locked(self, x, y):
+        return self.doors.get((x, y), False)
 
     def unlock_door(self, x, y):
-        for i, (dx, dy, locked) in enumerate(self.doors):
-            if locked and (x, y) == (dx, dy) and self.player_keys > 0:
-                self.doors[i] = (dx, dy, False)
-                self.player_keys -= 1
-                return True
-        return False
+        """Unlock the locked door on (x, y); returns False if there is none.
+        Spending the player's key is up to the caller"""
+        if not self.doors.get((x, y), False):
+            return False
+        self.doors[(x, y)] = False
+        return True
 
     def draw(self, screen):
-        for dx, dy, locked in self.doors:
+        if not self.images_loaded:
+            self.load_images()
+        for (dx, dy), locked in self.doors.items():
             door_img = self.door_locked_img if locked else self.door_unlocked_img
             screen.blit(door_img, (dx * self.tile_size, dy * self.tile_size))
         
@@ -1,87 +1,50 @@
 import pygame
 import random
 import math
+from interface.assets import assets
+from utils.sampling import sample_spaced
 
 class ObstacleManager:
+    IMAGE_FILES = ['pipesblue.png', 'pipesgreen.png', 'pipesred.png', 'table1.png', 'desk.png']
+
     def __init__(self, tile_size):
         self.tile_size = tile_size
-        self.obstacles = []
-        self.load_images()
+        self.obstacles = []  # (x, y, image file); images are loaded on the first draw
 
-    def load_images(self):
-        self.obstacle_images = []
-        image_files = ['pipesblue.png', 'pipesgreen.png', 'pipesred.png', 'table1.png', 'desk.png']
-        for img in image_files:
-            try:
-                loaded_img = pygame.image.load(f"assets/images/{img}")
-                scaled_img = pygame.transform.scale(loaded_img, (self.tile_size, self.tile_size))
-                self.obstacle_images.append(scaled_img)
-            except pygame.error as e:
-                print(f"Error loading obstacle image {img}: {e}")
+    def image(self, name):
+        """The obstacle image scaled to a tile, or None if it can't be loaded"""
+        try:
+            return assets.image(name, (self.tile_size, self.tile_size))
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading obstacle image {name}: {e}")
+            return None
 
     def place_obstacles(self, empty_cells, min_count=2, max_count=4):
         """
         Place obstacles strategically in the maze with improved placement logic
         """
         self.obstacles = []  # Clear existing obstacles
-        if not empty_cells or not self.obstacle_images:
-            print("No empty cells or obstacle images available")
+        if not empty_cells:
+            print("No empty cells available")
             return empty_cells
 
         # Calculate number of obstacles based on available space
         available_space = len(empty_cells)
         target_count = min(max_count, max(min_count, available_space // 20))
         
-        # Create a copy of empty cells to work with
-        available_cells = empty_cells.copy()
-        
         # Place obstacles with minimum spacing
         min_spacing = 2  # Reduced spacing to allow more placement options
-        placed_positions = set()
-
-        for _ in range(target_count):
-            if not available_cells:
-                break
-
-            # Try to place an obstacle
-            for attempt in range(10):  # Limit attempts per obstacle
-                if not available_cells:
-                    break
-                    
-                pos = random.choice(available_cells)
-                x, y = pos
-                
-                # Check if position is suitable
-                is_valid = all(abs(x - px) + abs(y - py) >= min_spacing 
-                             for px, py, _ in self.obstacles)
-                
-                if is_valid:
-                    # Place obstacle
-                    img = random.choice(self.obstacle_images)
-                    self.obstacles.append((x, y, img))
-                    placed_positions.add(pos)
-                    
-                    # Remove nearby cells from available cells
-                    available_cells = [
-                        cell for cell in available_cells
-                        if abs(cell[0] - x) + abs(cell[1] - y) >= min_spacing
-                    ]
-                    break
-                else:
-                    available_cells.remove(pos)
+        for x, y in sample_spaced(empty_cells, target_count, min_spacing):
+            self.obstacles.append((x, y, random.choice(self.IMAGE_FILES)))
+        placed_positions = {(x, y) for x, y, _ in self.obstacles}
 
         print(f"Placed {len(self.obstacles)} obstacles")
         
         # Return updated empty cells
         return [cell for cell in empty_cells if cell not in placed_positions]
 
-    def is_collision(self, x, y):
-        for ox, oy, _ in self.obstacles:
-            if int((x + self.tile_size // 2) // self.tile_size) == ox and \
-               int((y + self.tile_size // 2) // self.tile_size) == oy:
-                return True
-        return False
-
     def draw(self, screen):
-        for ox, oy, img in self.obstacles:
-            screen.blit(img, (ox * self.tile_size, oy * self.tile_size))
+        for ox, oy, name in self.obstacles:
+            img = self.image(name)
+            if img is not None:
+                screen.blit(img, (ox * self.tile_size, oy * self.tile_size))
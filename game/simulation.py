@@ -0,0 +1,272 @@
+import random
+import numpy as np
+from entities.obstacles import ObstacleManager
+from entities.items import ItemManager
+from entities.guard import GuardManager
+from utils.navgrid import NavGrid
+from utils.pathcache import PathCache
+from utils.pathfinding import get_pathfinder
+from utils.mazegen import generate_maze_grid
+from utils.spatial import SpatialHash
+
+# Tick results
+RUNNING = "RUNNING"
+CAUGHT = "CAUGHT"
+ESCAPED = "ESCAPED"
+TIMEOUT = "TIMEOUT"
+
+class Simulation:
+    """Game rules from main.py on a fixed tick, with no display, audio or wall clock.
+
+    The interactive game drives one instance from keyboard input; offline tools
+    drive their own with a policy, a callable mapping the simulation to a
+    (move_x, move_y) pair with each component in -1, 0 or 1.
+    """
+    def __init__(self, tile_size=40, cols=25, rows=19, player_speed=0.25, guard_speed=0.05,
+                 tick_rate=30, guard_navigation="astar", pathfinding_engine="astar",
+                 item_manager=None, obstacle_manager=None, guard_manager=None):
+        self.tile_size = tile_size
+        self.cols, self.rows = cols, rows
+        self.exit_tile = (cols - 2, rows - 2)
+        self.start_tile = (1, 1)
+        self.player_speed = player_speed
+        self.freeze_ticks = tick_rate  # Obstacles freeze the player for one second
+
+        self.item_manager = item_manager or ItemManager(tile_size)
+        self.obstacle_manager = obstacle_manager or ObstacleManager(tile_size)
+        self.guard_manager = guard_manager or GuardManager(
+            tile_size, guard_speed, guard_navigation, pathfinding_engine
+        )
+        self.find_path = get_pathfinder(pathfinding_engine)
+        # Paths are keyed on the grid version, so any tile change invalidates them
+        self.path_cache = PathCache(maxsize=512)
+        # Guards and obstacles by tile, so player checks only look nearby
+        self.spatial_index = SpatialHash()
+        self.guard_manager.spatial_index = self.spatial_index
+
+        self.maze = []
+        self.nav_grid = None
+        self.item_version = 0  # Bumped whenever a key is collected or a door unlocked
+        self.tick = 0
+        self.reset_player()
+
+    def reset_player(self):
+        self.player_x, self.player_y = self.start_tile[0] * self.tile_size, self.start_tile[1] * self.tile_size
+        self.previous_player = (self.player_x, self.player_y)  # Position before the last tick, for interpolation
+        self.player_keys = 0
+        self.player_frozen = False
+        self.freeze_start_tick = 0
+        self.freeze_cooldown_tick = -self.freeze_ticks
+
+    def reset(self, num_guards, seed=None):
+        """Build a fresh level and put the player back at the start"""
+        if seed is not None:
+            random.seed(seed)
+        self.tick = 0
+        self.reset_player()
+        self.generate_maze(num_guards)
+        self.place_entities(num_guards)
+
+    @property
+    def doors(self):
+        return self.item_manager.doors
+
+    @property
+    def keys(self):
+        return self.item_manager.keys
+
+    @property
+    def obstacles(self):
+        return self.obstacle_manager.obstacles
+
+    @property
+    def guard_positions(self):
+        return self.guard_manager.positions
+
+    @property
+    def player_tile(self):
+        return (int(self.player_x // self.tile_size), int(self.player_y // self.tile_size))
+
+    def astar_pathfinding(self, start, end, custom_maze=None):
+        """Cached search with the configured engine; accepts a custom maze for alternative path finding"""
+        if custom_maze is None or custom_maze is self.maze:
+            grid = self.nav_grid
+        elif isinstance(custom_maze, NavGrid):
+            grid = custom_maze
+        else:
+            # One-off list mazes get a fresh version, so there is nothing to cache
+            return self.find_path(NavGrid(custom_maze), start, end)
+
+        path = self.path_cache.get(start, end, grid.version)
+        if path is None:
+            path = self.find_path(grid, start, end)
+            self.path_cache.put(start, end, grid.version, path)
+        return path
+
+    def generate_maze(self, num_guards):
+        # Iterative recursive-backtracker with ~6.25% extra connections for multiple paths.
+        # Seeded from the random module so random.seed() still reproduces a level
+        self.maze = generate_maze_grid(self.cols, self.rows, seed=random.getrandbits(32)).tolist()
+        self.maze[self.exit_tile[1]][self.exit_tile[0]] = 0  # Ensure the exit is clear
+
+        # Ensure the bottom row is filled with walls
+        for x in range(self.cols):
+            self.maze[self.rows - 1][x] = 1
+
+        # Build the shared walkability grid once the layout is final
+        self.nav_grid = NavGrid(self.maze)
+
+        # Place doors and keys using the ItemManager instance
+        empty_cells = [(x, y) for y in range(self.rows) for x in range(self.cols)
+                      if self.maze[y][x] == 0]
+
+        self.item_manager.place_doors_and_keys(
+            self.nav_grid,
+            self.start_tile,
+            self.exit_tile,
+            num_guards,
+            empty_cells
+        )
+
+    def place_entities(self, num_guards):
+        # Get all empty cells that aren't used by keys or doors, the start or the exit,
+        # masking the few taken tiles out of the floor array in row-major order
+        free = self.nav_grid.walkable.astype(bool)
+        for x, y in [*self.keys, *self.doors, self.start_tile, self.exit_tile]:
+            free[y, x] = False
+        ys, xs = np.nonzero(free)
+        empty_cells = list(zip(xs.tolist(), ys.tolist()))
+
+        # Place guards first
+        empty_cells = self.guard_manager.place_guards(empty_cells, self.maze, num_guards)
+
+        # Then place obstacles with fixed counts
+        empty_cells = self.obstacle_manager.place_obstacles(empty_cells, min_count=2, max_count=4)
+        self.build_spatial_index()
+        return empty_cells
+
+    def build_spatial_index(self):
+        """Index guards and obstacles by tile; guards keep it current as they move.
+        Doors and keys are already keyed by tile in the ItemManager"""
+        index = self.spatial_index
+        index.clear()
+        for i, (x, y) in enumerate(self.guard_manager.tiles.tolist()):
+            index.insert("guard", i, (x, y))
+        for i, (ox, oy, _) in enumerate(self.obstacles):
+            index.insert("obstacle", i, (ox, oy))
+
+    def is_collision(self, x, y):
+        # Only walls and locked doors block movement
+        if not self.nav_grid.is_walkable(x, y):
+            return True
+        if self.item_manager.is_door_locked(x, y):  # Only locked doors block movement
+            if self.player_keys > 0:  # If player has keys, unlock the door
+                self.unlock_door(x, y)
+                return False  # Allow movement after unlocking
+            return True  # Block movement if no key
+        return False
+
+    def is_obstacle_collision(self, x, y):
+        # An obstacle on the tile under the player's centre
+        half = self.tile_size // 2
+        tile = (int((x + half) // self.tile_size), int((y + half) // self.tile_size))
+        return bool(self.spatial_index.at("obstacle", tile))
+
+    def collect_key(self, x, y):
+        if self.item_manager.collect_key(x, y):
+            self.player_keys += 1
+            self.item_version += 1
+
+    def unlock_door(self, x, y):
+        if self.player_keys > 0 and self.item_manager.unlock_door(x, y):
+            print(f"Unlocking door at ({x}, {y}) with key {self.player_keys}")
+            self.player_keys -= 1
+            self.item_version += 1
+            self.nav_grid.bump_version()  # Cached paths may now be stale
+
+    def update_guards(self):
+        self.guard_manager.update(self.nav_grid, self.player_tile, self.obstacles, self.doors)
+
+    def check_guard_collision(self):
+        # Player and guard hitboxes are a slightly smaller box than the tile size
+        inset = 5
+        size = self.tile_size - 2 * inset
+        player_left, player_top = self.player_x + inset, self.player_y + inset
+        # Overlapping boxes are less than a tile apart, so only guards on the 3x3 tiles around the player qualify
+        for i in self.spatial_index.query("guard", self.player_tile, radius=1):
+            gx, gy = self.guard_positions[i].tolist()
+            guard_left = gx * self.tile_size + inset
+            guard_top = gy * self.tile_size + inset
+            if (abs(int(player_left) - int(guard_left)) < size and
+                    abs(int(player_top) - int(guard_top)) < size):
+                return True
+        return False
+
+    def step(self, move_x, move_y):
+        """Advance one tick with the given movement input and return the tick result"""
+        self.previous_player = (self.player_x, self.player_y)
+        if self.check_guard_collision():
+            return CAUGHT
+
+        if not self.player_frozen:
+            next_x = self.player_x + move_x * self.tile_size * self.player_speed
+            next_y = self.player_y + move_y * self.tile_size * self.player_speed
+
+            # Check for collisions and update position
+            if not self.is_collision(int(next_x // self.tile_size), int(next_y // self.tile_size)):
+                self.player_x, self.player_y = next_x, next_y
+
+            # Check for obstacle collisions
+            if (self.is_obstacle_collision(self.player_x, self.player_y) and
+                    self.tick - self.freeze_cooldown_tick >= self.freeze_ticks):
+                self.player_frozen = True
+                self.freeze_start_tick = self.tick
+                self.freeze_cooldown_tick = self.tick
+
+            # Collect keys and unlock doors
+            tile_x, tile_y = self.player_tile
+            self.collect_key(tile_x, tile_y)
+            self.unlock_door(tile_x, tile_y)
+
+        # Check for Win Condition (Exit Reached)
+        if self.player_tile == self.exit_tile:
+            return ESCAPED
+
+        self.update_guards()
+        self.tick += 1
+
+        # Check if freeze time is over
+        if self.player_frozen and self.tick - self.freeze_start_tick >= self.freeze_ticks:
+            self.player_frozen = False
+
+        return RUNNING
+
+    def run(self, policy, max_ticks=10000):
+        """Step with policy until the player escapes, is caught or max_ticks pass"""
+        result = RUNNING
+        while result == RUNNING:
+            if self.tick >= max_ticks:
+                return TIMEOUT
+            result = self.step(*policy(self))
+        return result
+
+def scripted_policy(moves):
+    """Policy that replays a list of (move_x, move_y) inputs, then stands still"""
+    moves = iter(moves)
+    return lambda simulation: next(moves, (0, 0))
+
+class ExitSeekingPolicy:
+    """Player agent that walks the cached shortest path to the exit tile by tile"""
+    def __init__(self):
+        self.target = None
+
+    def __call__(self, simulation):
+        tile_size = simulation.tile_size
+        x, y = simulation.player_x, simulation.player_y
+        if self.target is None or (x, y) == (self.target[0] * tile_size, self.target[1] * tile_size):
+            path = simulation.astar_pathfinding(simulation.player_tile, simulation.exit_tile)
+            if len(path) < 2:
+                return (0, 0)
+            self.target = path[1]
+        target_x, target_y = self.target[0] * tile_size, self.target[1] * tile_size
+        return ((target_x > x) - (target_x < x), (target_y > y) - (target_y < y))
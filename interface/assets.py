@@ -0,0 +1,76 @@
+import os
+import pygame
+
+class SilentSound:
+    """Stands in for a sound file that is missing or can't be decoded"""
+    def play(self, loops=0):
+        pass
+
+    def stop(self):
+        pass
+
+class AssetManager:
+    """Loads each image, font and sound once, on first use, and caches it.
+
+    Images are cached by (path, size) with the unscaled original shared between
+    sizes. Once a display exists they are converted to its pixel format, which
+    makes blits several times faster; surfaces loaded before that (e.g. in
+    headless runs) are converted the next time they are requested.
+    """
+    def __init__(self, root=None):
+        # Relative to the package, not the working directory
+        self.root = root or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+        self.images = {}
+        self.fonts = {}
+        self.sounds = {}
+        self.converted = set()
+        self.loads = 0
+
+    def image(self, name, size=None):
+        """Surface for assets/images/<name>, scaled to size if given"""
+        key = (os.path.join(self.root, "images", name), tuple(size) if size else None)
+        surface = self.images.get(key)
+        if surface is None:
+            if key[1] is None:
+                surface = pygame.image.load(key[0])
+                self.loads += 1
+            else:
+                surface = pygame.transform.scale(self.image(name), key[1])
+            self.images[key] = surface
+        if key not in self.converted and pygame.display.get_surface() is not None:
+            surface = self.convert(surface)
+            self.images[key] = surface
+            self.converted.add(key)
+        return surface
+
+    @staticmethod
+    def convert(surface):
+        # Only images with per-pixel alpha need the slower alpha format
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def font(self, name, size):
+        key = (os.path.join(self.root, "fonts", name), size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.Font(*key)
+            self.loads += 1
+        return self.fonts[key]
+
+    def sound(self, name):
+        path = os.path.join(self.root, "sounds", name)
+        if path not in self.sounds:
+            try:
+                self.sounds[path] = pygame.mixer.Sound(path)
+                self.loads += 1
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error loading sound {name}: {e}")
+                self.sounds[path] = SilentSound()
+        return self.sounds[path]
+
+    def print_metrics(self):
+        print(f"Assets: {len(self.images)} images, {len(self.fonts)} fonts, "
+              f"{len(self.sounds)} sounds from {self.loads} file loads")
+
+# Shared by the game and every entity manager, so each file is read once
+assets = AssetManager()
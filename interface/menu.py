@@ -1,5 +1,5 @@
-import pygame
 from config.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from interface.assets import assets
 
 # Colors
 WHITE = (255, 255, 255)
@@ -23,7 +23,7 @@ class Menu:
 
     def draw_menu(self, dropdown_open):
         self.draw_floor()
-        player_menu = pygame.image.load('assets/images/menu_player.png')
+        player_menu = assets.image("menu_player.png")
         # ... rest of draw_menu code ...
 
     def main_menu(self):
@@ -0,0 +1,100 @@
+import pygame
+
+class SceneRenderer:
+    """Draws the maze from cached surfaces and updates only the parts of the screen that changed.
+
+    The background (floor, walls, exit and obstacles) is rendered once per maze.
+    The scene adds doors and keys on top of it and is rebuilt only when
+    simulation.item_version changes. Each frame, begin_frame() restores the
+    tiles under last frame's sprites from the scene, and end_frame() pushes
+    just those tiles plus the new sprite rects to the display.
+    """
+    def __init__(self, screen, tile_size, floor_img, wall_img, exit_img,
+                 door_locked_img, door_unlocked_img, key_img):
+        self.screen = screen
+        self.tile_size = tile_size
+        self.wall_img = wall_img
+        self.exit_img = exit_img
+        self.door_locked_img = door_locked_img
+        self.door_unlocked_img = door_unlocked_img
+        self.key_img = key_img
+        self.floor = self.tile_surface(screen.get_size(), floor_img)
+        self.background = None
+        self.scene = None
+        self._nav_grid = None
+        self._item_version = None
+        self._dirty_rects = []
+        self._full_redraw = True
+
+    def tile_surface(self, size, tile_img):
+        """A surface of the given size covered edge to edge with tile_img"""
+        surface = pygame.Surface(size)
+        for x in range(0, size[0], self.tile_size):
+            for y in range(0, size[1], self.tile_size):
+                surface.blit(tile_img, (x, y))
+        return surface
+
+    def build_background(self, simulation):
+        self.background = self.floor.copy()
+        tile_size = self.tile_size
+        for y, row in enumerate(simulation.maze):
+            for x, cell in enumerate(row):
+                if cell == 1:  # Wall
+                    self.background.blit(self.wall_img, (x * tile_size, y * tile_size))
+        ex, ey = simulation.exit_tile
+        self.background.blit(self.exit_img, (ex * tile_size, ey * tile_size))
+        # Obstacles never move once placed
+        for ox, oy, name in simulation.obstacles:
+            img = simulation.obstacle_manager.image(name)
+            if img is not None:
+                self.background.blit(img, (ox * tile_size, oy * tile_size))
+        self._nav_grid = simulation.nav_grid
+
+    def build_scene(self, simulation):
+        self.scene = self.background.copy()
+        tile_size = self.tile_size
+        for (dx, dy), locked in simulation.doors.items():
+            door_img = self.door_locked_img if locked else self.door_unlocked_img
+            self.scene.blit(door_img, (dx * tile_size, dy * tile_size))
+        for kx, ky in simulation.keys:
+            self.scene.blit(self.key_img, (kx * tile_size, ky * tile_size))
+        self._item_version = simulation.item_version
+
+    def refresh(self, simulation):
+        """Rebuild whichever cached layers are stale; returns True if anything was rebuilt"""
+        rebuilt = False
+        if simulation.nav_grid is not self._nav_grid:  # A new maze gets a new NavGrid
+            self.build_background(simulation)
+            rebuilt = True
+        if rebuilt or simulation.item_version != self._item_version:
+            self.build_scene(simulation)
+            rebuilt = True
+        return rebuilt
+
+    def invalidate(self):
+        """Repaint the whole screen next frame, e.g. after a menu drew over it"""
+        self._full_redraw = True
+
+    def draw_scene(self, simulation):
+        """Blit the full scene without touching the display, for screens drawn on top of the game"""
+        self.refresh(simulation)
+        self.screen.blit(self.scene, (0, 0))
+        self.invalidate()
+
+    def begin_frame(self, simulation):
+        if self.refresh(simulation):
+            self._full_redraw = True
+        if self._full_redraw:
+            self.screen.blit(self.scene, (0, 0))
+        else:
+            for rect in self._dirty_rects:
+                self.screen.blit(self.scene, rect, rect)
+
+    def end_frame(self, sprite_rects):
+        """Show the frame; sprite_rects are the rects returned by this frame's sprite blits"""
+        if self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+        else:
+            pygame.display.update(self._dirty_rects + sprite_rects)
+        self._dirty_rects = sprite_rects
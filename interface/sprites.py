@@ -0,0 +1,29 @@
+import pygame
+
+class SpriteAtlas:
+    """Every animation frame pre-built in both facings, looked up by (entity, state, frame, facing_right).
+
+    Flipping happens once in add(), so drawing never allocates a surface.
+    Frame numbers wrap around, so callers can pass a running counter.
+    """
+    def __init__(self):
+        self.frames = {}  # (entity, state, facing_right) -> list of surfaces
+
+    def add(self, entity, state, images, faces_right=True):
+        """Register an animation; faces_right says which way the source images look"""
+        flipped = [pygame.transform.flip(image, True, False) for image in images]
+        self.frames[(entity, state, faces_right)] = list(images)
+        self.frames[(entity, state, not faces_right)] = flipped
+
+    def get(self, entity, state, frame=0, facing_right=True):
+        frames = self.frames[(entity, state, facing_right)]
+        return frames[frame % len(frames)]
+
+    def get_memory_footprint(self):
+        """Bytes of pixel data held by all frames"""
+        return sum(image.get_pitch() * image.get_height()
+                   for frames in self.frames.values() for image in frames)
+
+    def print_metrics(self, name="Sprite Atlas"):
+        surfaces = sum(len(frames) for frames in self.frames.values())
+        print(f"{name}: {surfaces} surfaces, {self.get_memory_footprint() / 1024:.1f} KiB")
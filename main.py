@@ -1,13 +1,18 @@
+import os
+import sys
 import pygame
-import random
-from config.settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE
+from config.settings import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE, TICK_RATE, MAX_CATCH_UP_TICKS,
+                             GUARD_NAVIGATION, PATHFINDING_ENGINE)
 from interface.menu import Menu
+from interface.renderer import SceneRenderer
+from interface.sprites import SpriteAtlas
+from interface.assets import assets
 from entities.obstacles import ObstacleManager
 from entities.items import ItemManager
 from entities.guard import GuardManager
 from utils.metrics import Metrics
-from ai.agents import DQN
-from ai.reinforcement import QLearning
+from game.simulation import Simulation, RUNNING, CAUGHT, ESCAPED
+from ai.backends import create_backend
 
 # Initialize Pygame
 pygame.init()
@@ -33,140 +38,53 @@ ROWS, COLS = SCREEN_HEIGHT // TILE_SIZE, SCREEN_WIDTH // TILE_SIZE
 exit_tile = (COLS - 2, ROWS - 2)  
 PLAYER_SPEED = 0.25  # Slowed down player speed
 GUARD_SPEED = 0.05  # Slowed down guard speed
-FPS = 30  # Reduced frame rate
-
-# Load Assets
-win_img = pygame.image.load("assets/images/win.png")
-
-player_idle = pygame.image.load("assets/images/playeridle.png")
-player_run1 = pygame.image.load("assets/images/playerrun1.png")
-player_run2 = pygame.image.load("assets/images/playerrun2.png")
-player_idle = pygame.transform.scale(player_idle, (TILE_SIZE, TILE_SIZE))
-player_run1 = pygame.transform.scale(player_run1, (TILE_SIZE, TILE_SIZE))
-player_run2 = pygame.transform.scale(player_run2, (TILE_SIZE, TILE_SIZE))
-
-guard_idle = pygame.image.load("assets/images/copidle.png")
-guard_run1 = pygame.image.load("assets/images/coprun1.png")
-guard_run2 = pygame.image.load("assets/images/coprun2.png")
-guard2_run1 = pygame.image.load("assets/images/cop2run1.png")
-guard2_run2 = pygame.image.load("assets/images/cop2run2.png")
-guard2_idle = pygame.image.load("assets/images/cop2idle.png")
-guard_idle = pygame.transform.scale(guard_idle, (TILE_SIZE, TILE_SIZE))
-guard_run1 = pygame.transform.scale(guard_run1, (TILE_SIZE, TILE_SIZE))
-guard_run2 = pygame.transform.scale(guard_run2, (TILE_SIZE, TILE_SIZE))
-guard2_run1 = pygame.transform.scale(guard2_run1, (TILE_SIZE, TILE_SIZE))
-guard2_run2 = pygame.transform.scale(guard2_run2, (TILE_SIZE, TILE_SIZE))
-guard2_idle = pygame.transform.scale(guard2_idle, (TILE_SIZE, TILE_SIZE))
-
-floor_img = pygame.image.load("assets/images/floor.jpg")
-floor_img = pygame.transform.scale(floor_img, (TILE_SIZE, TILE_SIZE))
-
-wall_img = pygame.image.load("assets/images/wallgrey.png")
-wall_img = pygame.transform.scale(wall_img, (TILE_SIZE, TILE_SIZE))
-
-exit_img = pygame.image.load("assets/images/doorred.png")
-exit_img = pygame.transform.scale(exit_img, (TILE_SIZE, TILE_SIZE))
-
-door_locked_img = pygame.image.load("assets/images/celldoor.png")
-door_locked_img = pygame.transform.scale(door_locked_img, (TILE_SIZE, TILE_SIZE))
-door_unlocked_img = pygame.image.load("assets/images/doorholder.png")
-door_unlocked_img = pygame.transform.scale(door_unlocked_img, (TILE_SIZE, TILE_SIZE))
-
-key_img = pygame.image.load("assets/images/keyblue.png")
-key_img = pygame.transform.scale(key_img, (TILE_SIZE, TILE_SIZE))
-
-obstacle_images = [
-    pygame.transform.scale(pygame.image.load("assets/images/pipesblue.png"), (TILE_SIZE, TILE_SIZE)),
-    pygame.transform.scale(pygame.image.load("assets/images/pipesgreen.png"), (TILE_SIZE, TILE_SIZE)),
-    pygame.transform.scale(pygame.image.load("assets/images/pipesred.png"), (TILE_SIZE, TILE_SIZE)),
-    pygame.transform.scale(pygame.image.load("assets/images/table1.png"), (TILE_SIZE, TILE_SIZE)),
-    pygame.transform.scale(pygame.image.load("assets/images/desk.png"), (TILE_SIZE, TILE_SIZE))
-]
+TICK_SECONDS = 1.0 / TICK_RATE  # Player and guard speeds are per tick, not per frame
+
+# Load Assets (each file is read once and converted to the display format)
+TILE = (TILE_SIZE, TILE_SIZE)
+player_idle = assets.image("playeridle.png", TILE)
+player_run1 = assets.image("playerrun1.png", TILE)
+player_run2 = assets.image("playerrun2.png", TILE)
+
+# Both facings of every player frame, built once instead of flipped per frame
+player_sprites = SpriteAtlas()
+player_sprites.add("player", "idle", [player_idle])
+player_sprites.add("player", "run", [player_run1, player_run2])
+
+floor_img = assets.image("floor.jpg", TILE)
+wall_img = assets.image("wallgrey.png", TILE)
+exit_img = assets.image("doorred.png", TILE)
+door_locked_img = assets.image("celldoor.png", TILE)
+door_unlocked_img = assets.image("doorholder.png", TILE)
+key_img = assets.image("keyblue.png", TILE)
 
 # Fonts
-gameboy_font_path = "assets/fonts/Early GameBoy.ttf"
-title_font = pygame.font.Font(gameboy_font_path, 50)
-tagline_font = pygame.font.Font(gameboy_font_path, 25)
-button_font = pygame.font.Font(gameboy_font_path, 15)
+gameboy_font = "Early GameBoy.ttf"
+title_font = assets.font(gameboy_font, 50)
+tagline_font = assets.font(gameboy_font, 25)
+button_font = assets.font(gameboy_font, 15)
 fonts = {
     "title": title_font,
     "tagline": tagline_font,
     "button": button_font
 }
 
-# Player Position and Facing Direction
-player_x, player_y = TILE_SIZE, TILE_SIZE
+# Player Sprite and Facing Direction (position, keys and freezing live in the simulation)
 player_img = player_idle
 facing_right = True
 player_frame = 0
-player_frozen = False
-freeze_start_time = 0
-freeze_cooldown = 0
-
-# Maze, Guards, Obstacles, Doors, Keys, and Exit
-maze = []
-guards = []
-obstacles = []
-doors = []
-keys = []
-player_keys = 0
-# exit_tile = (COLS - 2, ROWS - 2)
 
 # Difficulty Settings
 difficulty = "Medium"
 guard_counts = {"Easy": 2, "Medium": 4, "Hard": 8}
 
-from heapq import heappop, heappush
-
-def astar_pathfinding(start, end, custom_maze=None):
-    """Modified A* to accept custom maze for alternative path finding"""
-    maze_to_use = custom_maze if custom_maze is not None else maze
-    open_set = []
-    heappush(open_set, (0, start))
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, end)}
-
-    while open_set:
-        _, current = heappop(open_set)
-
-        if current == end:
-            return reconstruct_path(came_from, current)
-
-        neighbors = [
-            (current[0] + dx, current[1] + dy)
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
-            if 0 <= current[0] + dx < COLS and 0 <= current[1] + dy < ROWS and maze_to_use[current[1] + dy][current[0] + dx] == 0
-        ]
-
-        for neighbor in neighbors:
-            tentative_g_score = g_score[current] + 1  # All moves cost 1
-
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, end)
-                heappush(open_set, (f_score[neighbor], neighbor))
-
-    return []  # No path found
-
-def heuristic(a, b):
-    # Manhattan distance
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-def reconstruct_path(came_from, current):
-    path = [current]
-    while current in came_from:
-        current = came_from[current]
-        path.append(current)
-    return path[::-1]
-
+# Floor, walls, exit, doors and keys come from cached surfaces
+renderer = SceneRenderer(screen, TILE_SIZE, floor_img, wall_img, exit_img,
+                         door_locked_img, door_unlocked_img, key_img)
 
 # Function to Draw the Floor
 def draw_floor():
-    for x in range(0, SCREEN_WIDTH, TILE_SIZE):
-        for y in range(0, SCREEN_HEIGHT, TILE_SIZE):
-            screen.blit(floor_img, (x, y))
+    screen.blit(renderer.floor, (0, 0))
 
 # Enhanced Maze Generation
 item_manager = ItemManager(TILE_SIZE)
@@ -174,164 +92,26 @@ item_manager = ItemManager(TILE_SIZE)
 # Initialize managers
 obstacle_manager = ObstacleManager(TILE_SIZE)
 item_manager = ItemManager(TILE_SIZE)
-guard_manager = GuardManager(TILE_SIZE, GUARD_SPEED)
+guard_manager = GuardManager(TILE_SIZE, GUARD_SPEED, GUARD_NAVIGATION, PATHFINDING_ENGINE)
 menu = Menu(screen, fonts, floor_img)
 
-def generate_maze():
-    global maze, doors, keys
-    maze = [[1] * COLS for _ in range(ROWS)]
-
-    # Recursive Backtracking Algorithm
-    def carve(x, y):
-        directions = [(0, -2), (0, 2), (-2, 0), (2, 0)]
-        random.shuffle(directions)
-
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-
-            if 0 < nx < COLS and 0 < ny < ROWS and maze[ny][nx] == 1:
-                maze[y + dy // 2][x + dx // 2] = 0  # Open the path
-                maze[ny][nx] = 0
-                carve(nx, ny)
-
-    # Start at the top-left corner
-    carve(1, 1)
-    maze[exit_tile[1]][exit_tile[0]] = 0  # Ensure the exit is clear
-
-    # Add extra connections for multiple paths
-    def add_connections():
-        for _ in range((ROWS * COLS) // 16):  # Add ~6.25% extra connections
-            x, y = random.randint(1, COLS - 2), random.randint(1, ROWS - 2)
-            if maze[y][x] == 1:  # If it's a wall
-                neighbors = [
-                    (x + dx, y + dy) for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
-                    if 0 <= x + dx < COLS and 0 <= y + dy < ROWS and maze[y + dy][x + dx] == 0
-                ]
-                if len(neighbors) >= 2:  # Only connect if two or more paths exist
-                    maze[y][x] = 0
-
-    add_connections()
-
-    # Ensure the bottom row is filled with walls
-    for x in range(COLS):
-        maze[ROWS - 1][x] = 1
-
-    # Place doors and keys using the ItemManager instance
-    empty_cells = [(x, y) for y in range(ROWS) for x in range(COLS) 
-                  if maze[y][x] == 0]
-    
-    empty_cells = item_manager.place_doors_and_keys(
-        maze, 
-        (1, 1), 
-        exit_tile, 
-        guard_counts[difficulty], 
-        empty_cells,
-        astar_pathfinding
-    )
-    
-    # Update global doors and keys from item_manager
-    global doors, keys
-    doors = item_manager.doors
-    keys = item_manager.keys
-
-# Function to Place Guards and Obstacles
-def place_entities():
-    global guards, obstacles
-    
-    # Get all empty cells that aren't used by keys or doors
-    empty_cells = [(x, y) for y in range(ROWS) for x in range(COLS) 
-                  if maze[y][x] == 0 and 
-                  (x, y) not in keys and 
-                  (x, y) not in [door[:2] for door in doors] and
-                  (x, y) != (1, 1) and  # Avoid player starting position
-                  (x, y) != exit_tile]   # Avoid exit tile
-
-    # Place guards first
-    empty_cells = guard_manager.place_guards(empty_cells, maze, guard_counts[difficulty])
-
-    # Set obstacle count to a maximum of 4
-    min_obstacles = 2
-    max_obstacles = 4
-
-    # Then place obstacles with fixed counts
-    empty_cells = obstacle_manager.place_obstacles(
-        empty_cells,
-        min_count=min_obstacles,
-        max_count=max_obstacles
-    )
-    
-    # Update global obstacles list from obstacle manager
-    obstacles = obstacle_manager.obstacles
-
-    return empty_cells
+# Game rules (maze, movement, keys, doors, guards) shared with headless runs
+simulation = Simulation(
+    TILE_SIZE, COLS, ROWS, PLAYER_SPEED, GUARD_SPEED, TICK_RATE,
+    pathfinding_engine=PATHFINDING_ENGINE,
+    item_manager=item_manager,
+    obstacle_manager=obstacle_manager,
+    guard_manager=guard_manager
+)
 
 def draw_maze():
-    for y in range(ROWS):
-        for x in range(COLS):
-            if maze[y][x] == 1:  # Wall
-                screen.blit(wall_img, (x * TILE_SIZE, y * TILE_SIZE))
-            # Remove checkpoint drawing
-            # elif maze[y][x] == 2:  # Checkpoint
-            #     pygame.draw.rect(screen, DARK_GREEN, (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-
-    for ox, oy, img in obstacles:
-        screen.blit(img, (ox * TILE_SIZE, oy * TILE_SIZE))
-
-    for dx, dy, locked in doors:
-        door_img = door_locked_img if locked else door_unlocked_img
-        screen.blit(door_img, (dx * TILE_SIZE, dy * TILE_SIZE))
-
-    for kx, ky in keys:
-        screen.blit(key_img, (kx * TILE_SIZE, ky * TILE_SIZE))
-
-    # Draw the Exit Tile
-    ex, ey = exit_tile
-    screen.blit(exit_img, (ex * TILE_SIZE, ey * TILE_SIZE))  # Use panel.png for exit
-
-    # Draw obstacles
-    obstacle_manager.draw(screen)
-
-# Collision Checking
-def is_collision(x, y):
-    # Only walls and locked doors block movement
-    if maze[y][x] == 1:
-        return True
-    for dx, dy, locked in doors:
-        if (x, y) == (dx, dy) and locked:  # Only locked doors block movement
-            if player_keys > 0:  # If player has keys, unlock the door
-                unlock_door(x, y)
-                return False  # Allow movement after unlocking
-            return True  # Block movement if no key
-    return False
-
-def is_obstacle_collision(x, y):
-    return obstacle_manager.is_collision(x, y)
-
-def collect_key(x, y):
-    global player_keys
-    for kx, ky in keys:
-        if (x, y) == (kx, ky):
-            keys.remove((kx, ky))
-            player_keys += 1
-            break
-
-def unlock_door(x, y):
-    global player_keys
-    for i, (dx, dy, locked) in enumerate(doors):
-        if locked and (x, y) == (dx, dy) and player_keys > 0:
-            print(f"Unlocking door at ({dx}, {dy}) with key {player_keys}")
-            doors[i] = (dx, dy, False)  # Unlock the door
-            player_keys -= 1
-            break
-
-def update_guards():
-    player_pos = (int(player_x // TILE_SIZE), int(player_y // TILE_SIZE))
-    guard_manager.update(maze, player_pos, obstacles, doors)
+    # Floor, walls, exit, obstacles, doors and keys in a single blit
+    renderer.draw_scene(simulation)
 
 # Function to Draw the Menu
 def draw_menu(dropdown_open, selected_button, selected_dropdown=-1):
     draw_floor()
-    player_menu = pygame.image.load('assets/images/menu_player.png')
+    player_menu = assets.image("menu_player.png")
     screen.blit(player_menu, (SCREEN_WIDTH // 2 - player_menu.get_width() // 2, SCREEN_HEIGHT // 2 - player_menu.get_height() // 2 + 40))
 
     title_text = title_font.render("Mission 804", True, WHITE)
@@ -371,10 +151,10 @@ def draw_menu(dropdown_open, selected_button, selected_dropdown=-1):
     pygame.display.flip()
 
 def main_menu():
-    global difficulty, player_x, player_y, player_img, facing_right, player_frame, player_frozen, freeze_start_time, freeze_cooldown, player_keys
+    global difficulty
     
     # Load and play menu music
-    menu_music = pygame.mixer.Sound("assets/sounds/menu.mp3")
+    menu_music = assets.sound("menu.mp3")
     menu_music.play(-1)  # Loop indefinitely
     
     menu_running = True
@@ -409,18 +189,8 @@ def main_menu():
                     elif event.key == pygame.K_RETURN:
                         if selected_button == 0:  # Start
                             # Reset game state and start game
-                            # Reset game state
-                            player_x, player_y = TILE_SIZE, TILE_SIZE
-                            player_img = player_idle
-                            facing_right = True
-                            player_frame = 0
-                            player_frozen = False
-                            freeze_start_time = 0
-                            freeze_cooldown = 0
-                            player_keys = 0
                             menu_music.stop()  # Stop menu music before starting game
-                            generate_maze()
-                            place_entities()
+                            reset_game_state()
                             menu_running = False
                         elif selected_button == 1:  # Difficulty
                             dropdown_open = not dropdown_open
@@ -437,17 +207,8 @@ def main_menu():
                 if SCREEN_WIDTH // 2 - 300 <= mouse_x <= SCREEN_WIDTH // 2 - 100:
                     if SCREEN_HEIGHT // 2 + 150 <= mouse_y <= SCREEN_HEIGHT // 2 + 200:
                         # Reset game state
-                        player_x, player_y = TILE_SIZE, TILE_SIZE
-                        player_img = player_idle
-                        facing_right = True
-                        player_frame = 0
-                        player_frozen = False
-                        freeze_start_time = 0
-                        freeze_cooldown = 0
-                        player_keys = 0
                         menu_music.stop()  # Stop menu music before starting game
-                        generate_maze()
-                        place_entities()
+                        reset_game_state()
                         menu_running = False  # Start the game
                 elif SCREEN_WIDTH // 2 - 100 <= mouse_x <= SCREEN_WIDTH // 2 + 100:
                     if SCREEN_HEIGHT // 2 + 150 <= mouse_y <= SCREEN_HEIGHT // 2 + 200:
@@ -470,6 +231,12 @@ def main_menu():
 
         draw_menu(dropdown_open, selected_button, selected_dropdown)
 
+        # Used by benchmark_startup.py: report once the first menu frame is on screen, then quit
+        if os.environ.get("MISSION804_EXIT_AFTER_FIRST_FRAME"):
+            print(f"First menu frame (torch loaded: {'torch' in sys.modules})", flush=True)
+            pygame.quit()
+            sys.exit(0)
+
 # Function to Draw the Pause Menu
 def draw_pause_menu():
     # Draw the pause sign (two rectangles)
@@ -519,20 +286,20 @@ def pause_menu():
 
 def draw_win_screen():
     """Draw the winning screen with image, text and looping sound"""
-    global player_x, player_y, player_img, facing_right, player_frame, player_frozen, freeze_start_time, freeze_cooldown, player_keys
+    global player_img, facing_right, player_frame
 
     # Load and play win sound on loop
-    win_sound = pygame.mixer.Sound("assets/sounds/win.mp3")
+    win_sound = assets.sound("win.mp3")
     win_sound.play(-1)  # -1 means loop indefinitely
 
     # Load and scale win image
-    win_img = pygame.image.load("assets/images/win.png")
+    win_img = assets.image("win.png")
     img_width = SCREEN_WIDTH // 2
     img_height = int(img_width * win_img.get_height() / win_img.get_width())
-    win_img = pygame.transform.scale(win_img, (img_width, img_height))
+    win_img = assets.image("win.png", (img_width, img_height))
 
     # Load font and create text
-    win_font = pygame.font.Font("assets/fonts/Early GameBoy.ttf", 30)
+    win_font = assets.font(gameboy_font, 30)
     win_text = win_font.render("Haqeeqi Azaadi Achieved", True, WHITE)
     menu_text = button_font.render("Back to Menu", True, WHITE)
 
@@ -550,10 +317,8 @@ def draw_win_screen():
     waiting = True
     while waiting:
         # Draw current game state in background
-        screen.fill(DARK_GREY)
-        draw_floor()
         draw_maze()
-        screen.blit(player_img, (player_x, player_y))
+        screen.blit(player_img, (simulation.player_x, simulation.player_y))
         guard_manager.draw(screen)
 
         # Draw semi-transparent overlay
@@ -587,34 +352,28 @@ def draw_win_screen():
                 if (button_x <= mouse_x <= button_x + button_width and 
                     button_y <= mouse_y <= button_y + button_height):
                     # Reset game state
-                    player_x, player_y = TILE_SIZE, TILE_SIZE
                     player_img = player_idle
                     facing_right = True
                     player_frame = 0
-                    player_frozen = False
-                    freeze_start_time = 0
-                    freeze_cooldown = 0
-                    player_keys = 0
+                    simulation.reset_player()
                     win_sound.stop()
                     waiting = False
                     main_menu()
 
 def draw_lose_screen():
     """Draw the losing screen with image, text and looping sound"""
-    global player_x, player_y, player_img, facing_right, player_frame, player_frozen, freeze_start_time, freeze_cooldown, player_keys
-
     # Load and play lose sound on loop
-    lose_sound = pygame.mixer.Sound("assets/sounds/lose.mp3")
+    lose_sound = assets.sound("lose.mp3")
     lose_sound.play(-1)  # -1 means loop indefinitely
 
     # Load and scale lose image
-    lose_img = pygame.image.load("assets/images/lose.png")
+    win_img = assets.image("win.png")
     img_width = SCREEN_WIDTH // 2
     img_height = int(img_width * win_img.get_height() / win_img.get_width()) + 100
-    lose_img = pygame.transform.scale(lose_img, (img_width, img_height))
+    lose_img = assets.image("lose.png", (img_width, img_height))
 
     # Load font and create text
-    lose_font = pygame.font.Font("assets/fonts/Early GameBoy.ttf", 30)
+    lose_font = assets.font(gameboy_font, 30)
     lose_text = lose_font.render("Mujh Se Jo Ho Sakta Tha,", True, WHITE)
     lose_text2 = lose_font.render("Mein ne Kiya", True, WHITE)
     menu_text = button_font.render("Back to Menu", True, WHITE)
@@ -637,10 +396,8 @@ def draw_lose_screen():
     waiting = True
     while waiting:
         # Draw current game state in background
-        screen.fill(DARK_GREY)
-        draw_floor()
         draw_maze()
-        screen.blit(player_img, (player_x, player_y))
+        screen.blit(player_img, (simulation.player_x, simulation.player_y))
         guard_manager.draw(screen)
 
         # Draw semi-transparent overlay
@@ -688,80 +445,55 @@ def draw_lose_screen():
                     lose_sound.stop()
                     return "MENU"
 
-def check_guard_collision():
-    # Get player hitbox (use a slightly smaller box than the tile size)
-    player_rect = pygame.Rect(
-        player_x + 5, 
-        player_y + 5, 
-        TILE_SIZE - 10, 
-        TILE_SIZE - 10
-    )
-    
-    # Check collision with each guard
-    for guard in guard_manager.guards:
-        guard_x = guard["pos"][0] * TILE_SIZE
-        guard_y = guard["pos"][1] * TILE_SIZE
-        guard_rect = pygame.Rect(
-            guard_x + 5,
-            guard_y + 5,
-            TILE_SIZE - 10,
-            TILE_SIZE - 10
-        )
-        
-        if player_rect.colliderect(guard_rect):
-            return True
-    
-    return False
-
 def reset_game_state():
     """Reset all game state variables"""
-    global player_x, player_y, player_img, facing_right, player_frame
-    global player_frozen, freeze_start_time, freeze_cooldown, player_keys
-    global maze, doors, keys, guards, obstacles
-    
-    # Reset player state
-    player_x, player_y = TILE_SIZE, TILE_SIZE
+    global player_img, facing_right, player_frame
+
+    # Reset player sprite state
     player_img = player_idle
     facing_right = True
     player_frame = 0
-    player_frozen = False
-    freeze_start_time = 0
-    freeze_cooldown = 0
-    player_keys = 0
-    
-    # Reset game entities
-    maze = []
-    doors = []
-    keys = []
-    guards = []
-    obstacles = []
-    
+
     # Regenerate game state
-    generate_maze()
-    place_entities()
+    simulation.reset(guard_counts[difficulty])
+    renderer.invalidate()
 
 # Initialize metrics
 metrics = Metrics()
 
-# Initialize DQN agent
-dqn_agent = DQN(input_dim=10, output_dim=4)  # Example dimensions
+def print_game_metrics():
+    """End-of-game report: play metrics, then what the caches and sprite atlases hold"""
+    metrics.print_metrics()
+    simulation.path_cache.print_metrics()
+    assets.print_metrics()
+    player_sprites.print_metrics("Player Sprites")
+    if guard_manager.sprites is not None:
+        guard_manager.sprites.print_metrics("Guard Sprites")
+
+# Initialize the DQN agent only when it drives the guards; this is the one place torch gets imported
+if GUARD_NAVIGATION == "dqn":
+    dqn_agent = create_backend("dqn", input_dim=10, output_dim=4)  # Inputs from ai.agents.encode_guard_features
+    guard_manager.policy_network = dqn_agent
 
 # Initialize QLearning agent
-qlearning_agent = QLearning()
+qlearning_agent = create_backend("qlearning")
 
 def game_loop():
     """Separate game loop function that can be reset and restarted"""
-    global player_x, player_y, player_img, facing_right, player_frame
-    global player_frozen, freeze_start_time, freeze_cooldown
+    global player_img, facing_right, player_frame
 
     # Initial setup
     reset_game_state()
     metrics.start_timer()  # Start the timer
 
     # Start game music
-    game_music = pygame.mixer.Sound("assets/sounds/game.mp3")
+    game_music = assets.sound("game.mp3")
     game_music.play(-1)
 
+    # Wall-clock time not yet simulated; the rules only ever advance by whole ticks
+    accumulator = 0.0
+    clock.tick()  # Don't count the time spent in the menu
+
     running = True
     while running:
         for event in pygame.event.get():
@@ -776,100 +508,89 @@ def game_loop():
                         return "MENU"
                     elif result == "RESTART":
                         reset_game_state()
+                    renderer.invalidate()  # The pause menu drew over the frame
                     game_music.play(-1)
+                    clock.tick()  # Time spent paused is not simulated
+                    accumulator = 0.0
+
+        # Handle player input
+        keys = pygame.key.get_pressed()
+        if not simulation.player_frozen:
+            if keys[pygame.K_LEFT] and facing_right:
+                facing_right = False
+            if keys[pygame.K_RIGHT] and not facing_right:
+                facing_right = True
+        move_x = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+        move_y = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+        moving = keys[pygame.K_LEFT] or keys[pygame.K_RIGHT] or keys[pygame.K_UP] or keys[pygame.K_DOWN]
+
+        # Advance the game rules by as many fixed ticks as the last frame took
+        accumulator += clock.tick(FPS) / 1000.0
+        result = RUNNING
+        ticks = 0
+        while accumulator >= TICK_SECONDS:
+            result = simulation.step(move_x, move_y)
+            accumulator -= TICK_SECONDS
+            ticks += 1
+            if result != RUNNING:
+                break
+
+            # Update player animation
+            if moving:
+                player_frame = (player_frame + 1) % 20
+
+            # Record average distance to player
+            player_pos = simulation.player_tile
+            for guard_pos in guard_manager.positions.tolist():
+                distance = abs(guard_pos[0] - player_pos[0]) + abs(guard_pos[1] - player_pos[1])
+                metrics.record_distance(distance)
+
+            if ticks == MAX_CATCH_UP_TICKS:
+                # Too far behind: drop the backlog and let the game slow down
+                accumulator = min(accumulator, TICK_SECONDS)
+                break
 
         # Check for guard collision
-        if check_guard_collision():
+        if result == CAUGHT:
             metrics.record_interception()  # Record interception
             metrics.stop_timer()  # Stop the timer
             game_music.stop()
             result = draw_lose_screen()
             if result == "MENU":
-                metrics.print_metrics()  # Print metrics
+                print_game_metrics()
                 return "MENU"
             elif result == "RESTART":
                 reset_game_state()  # Use the new reset function
                 metrics.start_timer()  # Restart the timer
                 game_music.play(-1)
+                clock.tick()
+                accumulator = 0.0
                 continue
 
-        # Handle player movement and game logic
-        keys = pygame.key.get_pressed()
-        next_x, next_y = player_x, player_y
-
-        if not player_frozen:
-            # Handle movement
-            if keys[pygame.K_UP]:
-                next_y -= TILE_SIZE * PLAYER_SPEED
-            if keys[pygame.K_DOWN]:
-                next_y += TILE_SIZE * PLAYER_SPEED
-            if keys[pygame.K_LEFT]:
-                next_x -= TILE_SIZE * PLAYER_SPEED
-                if facing_right:
-                    player_img = pygame.transform.flip(player_idle, True, False)
-                    facing_right = False
-            if keys[pygame.K_RIGHT]:
-                next_x += TILE_SIZE * PLAYER_SPEED
-                if not facing_right:
-                    player_img = player_idle
-                    facing_right = True
-
-            # Check for collisions and update position
-            if not is_collision(int(next_x // TILE_SIZE), int(next_y // TILE_SIZE)):
-                player_x, player_y = next_x, next_y
-
-            # Check for obstacle collisions
-            if is_obstacle_collision(player_x, player_y) and pygame.time.get_ticks() - freeze_cooldown >= 1000:
-                player_frozen = True
-                freeze_start_time = pygame.time.get_ticks()
-                freeze_cooldown = pygame.time.get_ticks()
-
-            # Collect keys and unlock doors
-            collect_key(int(player_x // TILE_SIZE), int(player_y // TILE_SIZE))
-            unlock_door(int(player_x // TILE_SIZE), int(player_y // TILE_SIZE))
-
-        # Update player animation
-        if keys[pygame.K_LEFT] or keys[pygame.K_RIGHT] or keys[pygame.K_UP] or keys[pygame.K_DOWN]:
-            player_frame = (player_frame + 1) % 20
-            if player_frame < 10:
-                player_img = player_run1 if facing_right else pygame.transform.flip(player_run1, True, False)
-            else:
-                player_img = player_run2 if facing_right else pygame.transform.flip(player_run2, True, False)
+        if moving:
+            player_img = player_sprites.get("player", "run", player_frame // 10, facing_right)
         else:
-            player_img = player_idle if facing_right else pygame.transform.flip(player_idle, True, False)
+            player_img = player_sprites.get("player", "idle", 0, facing_right)
 
         # Check for Win Condition (Exit Reached)
-        if (int(player_x // TILE_SIZE), int(player_y // TILE_SIZE)) == exit_tile:
+        if result == ESCAPED:
             metrics.stop_timer()  # Stop the timer
             game_music.stop()
             print("You Escaped!")
             draw_win_screen()
-            metrics.print_metrics()  # Print metrics
+            print_game_metrics()
             return "MENU"
 
-        # Update everything else
-        update_guards()
-        
-        # Draw everything
-        screen.fill(DARK_GREY)
-        draw_floor()
-        draw_maze()
-        screen.blit(player_img, (player_x, player_y))
-        guard_manager.draw(screen)
-
-        pygame.display.flip()
-        clock.tick(FPS)
-
-        # Check if freeze time is over
-        if player_frozen and pygame.time.get_ticks() - freeze_start_time >= 1000:  # Reduced freeze time to 1 second
-            player_frozen = False
-
-        # Record average distance to player
-        player_pos = (int(player_x // TILE_SIZE), int(player_y // TILE_SIZE))
-        for guard in guard_manager.guards:
-            guard_pos = guard["pos"]
-            distance = abs(guard_pos[0] - player_pos[0]) + abs(guard_pos[1] - player_pos[1])
-            metrics.record_distance(distance)
+        # Draw everything: restore last frame's sprite tiles, then redraw only what moved.
+        # Sprites sit between the last two ticks, by how far the clock is into the next one
+        alpha = min(accumulator / TICK_SECONDS, 1.0)
+        previous_x, previous_y = simulation.previous_player
+        player_at = (previous_x + (simulation.player_x - previous_x) * alpha,
+                     previous_y + (simulation.player_y - previous_y) * alpha)
+        renderer.begin_frame(simulation)
+        sprite_rects = [screen.blit(player_img, player_at)]
+        sprite_rects += guard_manager.draw(screen, alpha)
+        renderer.end_frame(sprite_rects)
 
     return "QUIT"
 
@@ -0,0 +1,41 @@
+import numpy as np
+from utils.distance import bfs_distances, manhattan_distances
+from utils.navgrid import NavGrid
+
+def brute_force_bfs(grid, sources):
+    """Nearest-source distance as the minimum of one plain BFS per source"""
+    best = np.full((grid.height, grid.width), -1)
+    for source in sources:
+        distances = {source: 0} if grid.is_walkable(*source) else {}
+        frontier = list(distances)
+        while frontier:
+            tile = frontier.pop(0)
+            for neighbor in grid.neighbors(tile):
+                if neighbor not in distances:
+                    distances[neighbor] = distances[tile] + 1
+                    frontier.append(neighbor)
+        for (x, y), distance in distances.items():
+            if best[y, x] < 0 or distance < best[y, x]:
+                best[y, x] = distance
+    return best
+
+def test_bfs_distances_match_per_source_search():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        width, height = rng.integers(1, 15, 2)
+        grid = NavGrid((rng.random((height, width)) < 0.3).astype(int))
+        sources = [tuple(int(v) for v in p) for p in zip(rng.integers(0, width, 4), rng.integers(0, height, 4))]
+        sources = sources[:rng.integers(0, 5)]  # Includes wall and empty sources
+        assert np.array_equal(bfs_distances(grid, sources), brute_force_bfs(grid, sources))
+
+def test_manhattan_distances_match_brute_force():
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        width, height = (int(v) for v in rng.integers(1, 20, 2))
+        count = int(rng.integers(1, 8))
+        sources = list(zip(rng.integers(0, width, count).tolist(), rng.integers(0, height, count).tolist()))
+        ys, xs = np.mgrid[:height, :width]
+        expected = np.min([np.abs(xs - sx) + np.abs(ys - sy) for sx, sy in sources], axis=0)
+        assert np.array_equal(manhattan_distances((height, width), sources), expected)
+    # Without sources every tile is unreached, width + height away
+    assert (manhattan_distances((3, 4), []) == 7).all()
@@ -0,0 +1,46 @@
+import random
+from ai.dstar import DStarLite
+from utils.distance import bfs_distances
+from utils.mazegen import generate_maze_grid
+from utils.navgrid import NavGrid
+
+def check_path(grid, guard, player, path):
+    """path must be a shortest walkable route from guard to player (BFS distance)"""
+    distance = int(bfs_distances(grid, [guard])[player[1], player[0]])
+    assert len(path) == distance
+    previous = guard
+    for tile in path:
+        assert grid.is_walkable(*tile)
+        assert abs(tile[0] - previous[0]) + abs(tile[1] - previous[1]) == 1
+        previous = tile
+    assert previous == player
+
+def chase(seed, toggle_every):
+    rng = random.Random(seed)
+    grid = NavGrid(generate_maze_grid(31, 31, seed=seed, extra_connection_ratio=0.2))
+    floor = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.is_walkable(x, y)]
+    guard, player = rng.choice(floor), rng.choice(floor)
+    planner = DStarLite()
+    for step in range(150):
+        neighbors = grid.neighbors(player)
+        if neighbors:
+            player = rng.choice(neighbors)
+        if toggle_every and step % toggle_every == 0:
+            # Open or close a tile, like a door, but never under the guard or player
+            tile = (rng.randrange(1, grid.width - 1), rng.randrange(1, grid.height - 1))
+            if tile not in (guard, player):
+                grid.set_walkable(*tile, not grid.is_walkable(*tile))
+        next_pos = planner.next_step(grid, guard, player)
+        if guard == player or not grid.same_component(guard, player):
+            assert next_pos is None
+            continue
+        check_path(grid, guard, player, planner.path_to_player())
+        guard = next_pos
+
+def test_moving_player_paths_stay_shortest():
+    for seed in range(10):
+        chase(seed, toggle_every=0)
+
+def test_walkability_changes_are_repaired():
+    for seed in range(40):
+        chase(seed, toggle_every=3)
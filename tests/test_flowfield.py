@@ -0,0 +1,26 @@
+import random
+from ai.flowfield import FlowField
+from utils.mazegen import generate_maze_grid
+from utils.navgrid import NavGrid
+
+def steps(error_rate, seed=0):
+    """(distance before, distance after) for one step from every floor tile"""
+    random.seed(seed)
+    grid = NavGrid(generate_maze_grid(31, 31, seed=seed, extra_connection_ratio=0.2))
+    floor = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.is_walkable(x, y)]
+    field = FlowField()
+    field.update(grid, floor[0])
+    result = []
+    for tile in floor[1:]:
+        next_pos = field.next_step(tile, error_rate)
+        assert grid.is_walkable(*next_pos)
+        assert abs(next_pos[0] - tile[0]) + abs(next_pos[1] - tile[1]) == 1
+        result.append((field.distance_at(tile), field.distance_at(next_pos)))
+    return result
+
+def test_without_errors_every_step_descends():
+    assert all(after == before - 1 for before, after in steps(0.0))
+
+def test_errors_sometimes_step_uphill():
+    uphill = sum(after > before for before, after in steps(0.3))
+    assert uphill > 0
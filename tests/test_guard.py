@@ -0,0 +1,32 @@
+import io, contextlib, random
+import numpy as np
+from game.simulation import Simulation
+
+def test_search_budget_caps_and_rotates_planning():
+    simulation = Simulation(guard_navigation="astar")
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation.reset(8, seed=0)
+    random.seed(0)
+    manager = simulation.guard_manager
+    manager.search_budget = 3
+    planned = np.zeros(len(manager), dtype=bool)
+    for tick in range(3):
+        waiting = manager.path_cursors >= manager.path_lengths
+        simulation.update_guards()
+        started = waiting & (manager.path_lengths > 0)
+        # Every guard starts out needing a search, so at most 3 get a path per tick
+        assert started.sum() <= manager.search_budget
+        planned |= started
+    # Guards refused a search are planned on the following ticks
+    assert planned.all()
+
+def test_flowfield_warm_up_needs_no_searches():
+    simulation = Simulation(guard_navigation="flowfield")
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation.reset(8, seed=0)
+    manager = simulation.guard_manager
+    manager.search_budget = 0
+    simulation.update_guards()
+    # Wandering guards still get their one-step paths
+    assert (manager.path_lengths == 1).all()
+    assert manager.flow_field.recomputes == 0
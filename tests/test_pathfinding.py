@@ -0,0 +1,81 @@
+import random
+import numpy as np
+from utils.distance import bfs_distances
+from utils.mazegen import generate_maze_grid
+from utils.navgrid import NavGrid
+from utils.pathfinding import astar, bidirectional_astar, jump_point_search, k_shortest_paths
+
+ENGINES = [astar, bidirectional_astar, jump_point_search]
+
+def random_grid(seed, width, height, wall_ratio):
+    rng = np.random.default_rng(seed)
+    return NavGrid((rng.random((height, width)) < wall_ratio).astype(int))
+
+def floor_tiles(grid):
+    return [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.is_walkable(x, y)]
+
+def check_path(grid, start, end, path, distance):
+    """path must run from start to end over adjacent walkable tiles in distance steps"""
+    if distance < 0:
+        assert path == []
+        return
+    assert path[0] == start and path[-1] == end
+    assert len(path) - 1 == distance
+    for a, b in zip(path, path[1:]):
+        assert grid.is_walkable(*b)
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+
+def check_engines(grid, seed, pairs=30):
+    rng = random.Random(seed)
+    floor = floor_tiles(grid)
+    for _ in range(pairs):
+        start, end = rng.choice(floor), rng.choice(floor)
+        distance = int(bfs_distances(grid, [start])[end[1], end[0]])
+        for engine in ENGINES:
+            check_path(grid, start, end, engine(grid, start, end), distance)
+
+def test_engines_match_bfs_on_random_grids():
+    for seed in range(20):
+        check_engines(random_grid(seed, 30, 20, wall_ratio=0.3), seed)
+
+def test_engines_match_bfs_on_mazes():
+    for seed in range(10):
+        check_engines(NavGrid(generate_maze_grid(41, 31, seed=seed, extra_connection_ratio=0.2)), seed)
+
+def simple_path_costs(grid, start, end):
+    """Cost of every loopless path from start to end, by exhaustive search"""
+    costs = []
+    path = [start]
+    on_path = {start}
+
+    def extend(tile):
+        if tile == end:
+            costs.append(len(path) - 1)
+            return
+        for neighbor in grid.neighbors(tile):
+            if neighbor not in on_path:
+                path.append(neighbor)
+                on_path.add(neighbor)
+                extend(neighbor)
+                on_path.remove(neighbor)
+                path.pop()
+
+    extend(start)
+    return sorted(costs)
+
+def test_k_shortest_paths_match_exhaustive_search():
+    for seed in range(40):
+        grid = random_grid(seed, 5, 5, wall_ratio=0.25)
+        rng = random.Random(seed)
+        floor = floor_tiles(grid)
+        if len(floor) < 2:
+            continue
+        start, end = rng.sample(floor, 2)
+        k = rng.randint(1, 6)
+        expected = simple_path_costs(grid, start, end)[:k]
+        results = k_shortest_paths(grid, start, end, k)
+        assert [cost for cost, _ in results] == expected
+        assert len({tuple(path) for _, path in results}) == len(results)
+        for cost, path in results:
+            assert len(set(path)) == len(path)  # No tile visited twice
+            check_path(grid, start, end, list(path), cost)
@@ -0,0 +1,10 @@
+import numpy as np
+from train_guards import parse_args, train
+
+def test_short_qlearning_run_stays_bounded():
+    # Rewards lie in [-1, 10], so no value can leave +-10 / (1 - gamma)
+    trainer = train(parse_args(["--backend", "qlearning", "--workers", "2", "--rounds", "3",
+                                "--episodes-per-round", "8", "--max-ticks", "600", "--seed", "1"]))
+    q_table = trainer.model.q_table
+    assert q_table.any()
+    assert np.abs(q_table).max() <= 10 / (1 - trainer.model.gamma)
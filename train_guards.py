@@ -0,0 +1,275 @@
+import argparse
+import multiprocessing
+from abc import ABC, abstractmethod
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from ai.agents import VecGuardEnv, encode_guard_features
+from ai.backends import create_backend
+from ai.reinforcement import QLearning, DenseQLearning
+from game.simulation import Simulation, ExitSeekingPolicy, CAUGHT, TIMEOUT
+
+# Self-play trainer: worker processes play whole episodes of the game rules
+# against a read-only snapshot of the guard policy and send back their
+# transitions; the parent merges them into the central model once per round
+# and publishes a fresh snapshot. Every episode is played on a freshly generated
+# maze, so models only see maze-independent inputs: the Q-table is indexed by
+# the walls around the guard (DenseQLearning local=True), not by its cell.
+
+class GuardPolicy(ABC):
+    """Epsilon-greedy guard controller for GuardManager's "policy" mode that records transitions.
+
+    A guard decides once per tile. Its transition closes at its next decision,
+    rewarded by QLearning.get_reward on the change in Manhattan distance.
+    """
+    def __init__(self, epsilon, seed=None):
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+        self.rewarder = QLearning()
+        self.transitions = []
+        self.pending = {}
+
+    def begin_episode(self):
+        self.pending = {}
+
+    @abstractmethod
+    def encode(self, tile, player_pos, nav_grid):
+        """State for a guard deciding on tile"""
+
+    @abstractmethod
+    def greedy_action(self, state):
+        """Best action index for a state"""
+
+    @staticmethod
+    @abstractmethod
+    def pack_states(states):
+        """Stack a sequence of states into one array"""
+
+    def __call__(self, guard_index, tile, player_pos, nav_grid):
+        state = self.encode(tile, player_pos, nav_grid)
+        distance = self.rewarder.manhattan_distance(tile, player_pos)
+        self._close(guard_index, state, distance, False, 0)
+
+        if self.rng.random() < self.epsilon:
+            action = int(self.rng.integers(len(VecGuardEnv.ACTION_DELTAS)))
+        else:
+            action = self.greedy_action(state)
+        self.pending[guard_index] = (state, action, distance)
+
+        dx, dy = VecGuardEnv.ACTION_DELTAS[action]
+        next_pos = (tile[0] + int(dx), tile[1] + int(dy))
+        # Bumping into a wall leaves the guard in place for this decision
+        return next_pos if nav_grid.is_walkable(*next_pos) else None
+
+    def end_episode(self, simulation, result):
+        """Close every open transition; on a catch the guard nearest the player takes the reward"""
+        player_pos = (simulation.player_x / simulation.tile_size, simulation.player_y / simulation.tile_size)
+        catcher = None
+        guard_positions = simulation.guard_positions.tolist()
+        if result == CAUGHT and guard_positions:
+            catcher = min(range(len(guard_positions)),
+                          key=lambda i: self.rewarder.manhattan_distance(guard_positions[i], player_pos))
+        done = int(result != TIMEOUT)
+        for guard_index, (x, y) in enumerate(guard_positions):
+            tile = (int(x), int(y))
+            state = self.encode(tile, simulation.player_tile, simulation.nav_grid)
+            distance = self.rewarder.manhattan_distance(tile, simulation.player_tile)
+            self._close(guard_index, state, distance, guard_index == catcher, done)
+        self.pending = {}
+
+    def _close(self, guard_index, next_state, new_distance, found_player, done):
+        if guard_index not in self.pending:
+            return
+        state, action, old_distance = self.pending.pop(guard_index)
+        reward = self.rewarder.get_reward(old_distance, new_distance, found_player)
+        self.transitions.append((state, action, reward, next_state, done))
+
+    def take_transitions(self):
+        """Transitions since the last call as (states, actions, rewards, next_states, dones) arrays"""
+        transitions, self.transitions = self.transitions, []
+        if not transitions:
+            return None
+        states, actions, rewards, next_states, dones = zip(*transitions)
+        return (self.pack_states(states), np.array(actions, dtype=np.int64),
+                np.array(rewards, dtype=np.float32), self.pack_states(next_states),
+                np.array(dones, dtype=np.float32))
+
+class QLearningGuardPolicy(GuardPolicy):
+    """Acts on a memory-mapped DenseQLearning table; states are QLearning int keys"""
+    def __init__(self, table_path, epsilon, seed=None):
+        super().__init__(epsilon, seed)
+        self.q_learning = DenseQLearning.load(table_path, mmap=True, local=True)
+
+    def encode(self, tile, player_pos, nav_grid):
+        return self.q_learning.get_state(tile, player_pos, nav_grid)
+
+    def greedy_action(self, state):
+        q_values = self.q_learning.q_table[self.q_learning.state_index(state)]
+        if not q_values.any():
+            return int(self.rng.integers(len(q_values)))
+        return int(q_values.argmax())
+
+    @staticmethod
+    def pack_states(states):
+        return np.array(states, dtype=np.int64)
+
+class DQNGuardPolicy(GuardPolicy):
+    """Acts with a local DQN copy; states are encode_guard_features rows"""
+    def __init__(self, state_dict, epsilon, seed=None):
+        super().__init__(epsilon, seed)
+        self.model = create_backend("dqn", 10, 4)
+        self.model.load_state_dict(state_dict)
+        self.model.eval()
+
+    def encode(self, tile, player_pos, nav_grid):
+        return encode_guard_features([tile], player_pos, nav_grid)[0]
+
+    def greedy_action(self, state):
+        return int(self.model.act_batch(state[None, :])[0])
+
+    @staticmethod
+    def pack_states(states):
+        return np.stack(states)
+
+# Each worker process owns one Simulation for its whole lifetime
+_simulation = None
+_settings = None
+
+def _init_worker(settings):
+    global _simulation, _settings
+    # Managers print every placement and unlock; keep worker output quiet
+    sys.stdout = open(os.devnull, "w")
+    if settings["backend"] == "dqn":
+        import torch
+        torch.set_num_threads(1)  # One core per worker; the pool provides the parallelism
+    _settings = settings
+    _simulation = Simulation(cols=settings["cols"], rows=settings["rows"], guard_navigation="policy")
+
+def _run_episodes(task):
+    """Play one episode per seed against the snapshot and return (transitions, results)"""
+    snapshot, seeds, task_seed = task
+    if _settings["backend"] == "qlearning":
+        policy = QLearningGuardPolicy(snapshot, _settings["epsilon"], task_seed)
+    else:
+        policy = DQNGuardPolicy(snapshot, _settings["epsilon"], task_seed)
+    _simulation.guard_manager.guard_policy = policy
+
+    results = []
+    for seed in seeds:
+        _simulation.reset(_settings["guards"], seed=int(seed))
+        policy.begin_episode()
+        result = _simulation.run(ExitSeekingPolicy(), max_ticks=_settings["max_ticks"])
+        policy.end_episode(_simulation, result)
+        results.append(result)
+    return policy.take_transitions(), results
+
+class Trainer:
+    """Central model plus the merge and snapshot steps for one backend"""
+    def __init__(self, backend, seed=None, updates_per_round=64):
+        self.backend = backend
+        self.updates_per_round = updates_per_round
+        if backend == "qlearning":
+            self.model = DenseQLearning(local=True, seed=seed)
+            self.snapshot_dir = tempfile.TemporaryDirectory()
+        else:
+            self.model = create_backend("dqn", 10, 4)
+            self.dqn_trainer = create_backend("dqn_trainer", self.model, None, seed=seed)
+
+    def snapshot(self, round_index):
+        if self.backend == "qlearning":
+            # Workers memory-map the table, so it is shared rather than copied. Each round
+            # writes a new file, since rewriting one that workers have mapped would corrupt it
+            for name in os.listdir(self.snapshot_dir.name):
+                os.remove(os.path.join(self.snapshot_dir.name, name))
+            path = os.path.join(self.snapshot_dir.name, f"q_table_{round_index}.npy")
+            self.model.save(path)
+            return path
+        return {name: tensor.clone() for name, tensor in self.model.state_dict().items()}
+
+    def merge(self, transitions):
+        states, actions, rewards, next_states, dones = transitions
+        if self.backend == "qlearning":
+            self.model.update_batch(states, actions, rewards, next_states)
+        else:
+            self.dqn_trainer.buffer.add_batch(states, actions, rewards, next_states, dones)
+
+    def end_round(self):
+        if self.backend == "dqn" and len(self.dqn_trainer.buffer) >= self.dqn_trainer.buffer.batch_size:
+            for _ in range(self.updates_per_round):
+                self.dqn_trainer.train_step()
+
+    def save(self, path):
+        if self.backend == "qlearning":
+            self.model.save(path)
+        else:
+            import torch
+            torch.save(self.model.state_dict(), path)
+
+def train(args):
+    settings = {
+        "backend": args.backend, "cols": args.cols, "rows": args.rows, "guards": args.guards,
+        "epsilon": args.epsilon, "max_ticks": args.max_ticks,
+    }
+    # Build one Simulation here first: if that fails (e.g. missing assets), the error
+    # surfaces once instead of the pool respawning failing workers forever
+    Simulation(cols=args.cols, rows=args.rows, guard_navigation="policy")
+    trainer = Trainer(args.backend, seed=args.seed, updates_per_round=args.updates_per_round)
+    rng = np.random.default_rng(args.seed)
+    # Split each round into a few tasks per worker so slow episodes don't stall the round
+    tasks_per_round = max(1, min(args.episodes_per_round, args.workers * 4))
+
+    start_time = time.perf_counter()
+    total_episodes = 0
+    with multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(settings,)) as pool:
+        for round_index in range(args.rounds):
+            round_start = time.perf_counter()
+            snapshot = trainer.snapshot(round_index)
+            seeds = rng.integers(0, 2 ** 32, args.episodes_per_round)
+            task_seeds = rng.integers(0, 2 ** 32, tasks_per_round)
+            tasks = [(snapshot, chunk, int(task_seed))
+                     for chunk, task_seed in zip(np.array_split(seeds, tasks_per_round), task_seeds)]
+
+            outcomes = {}
+            transition_count = 0
+            for transitions, results in pool.imap_unordered(_run_episodes, tasks):
+                if transitions is not None:
+                    trainer.merge(transitions)
+                    transition_count += len(transitions[1])
+                for result in results:
+                    outcomes[result] = outcomes.get(result, 0) + 1
+            trainer.end_round()
+
+            total_episodes += args.episodes_per_round
+            round_time = time.perf_counter() - round_start
+            summary = ", ".join(f"{name.lower()} {count}" for name, count in sorted(outcomes.items()))
+            print(f"Round {round_index + 1}/{args.rounds}: {args.episodes_per_round / round_time:.1f} episodes/s, "
+                  f"{transition_count} transitions ({summary})")
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Trained on {total_episodes} episodes with {args.workers} workers: "
+          f"{total_episodes / elapsed:.1f} episodes/s")
+    if args.output:
+        trainer.save(args.output)
+        print(f"Saved {args.backend} model to {args.output}")
+    return trainer
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train guard policies with multi-process self-play")
+    parser.add_argument("--backend", choices=["qlearning", "dqn"], default="qlearning")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--episodes-per-round", type=int, default=256)
+    parser.add_argument("--updates-per-round", type=int, default=64, help="DQN gradient steps after each merge")
+    parser.add_argument("--guards", type=int, default=4)
+    parser.add_argument("--cols", type=int, default=25)
+    parser.add_argument("--rows", type=int, default=19)
+    parser.add_argument("--epsilon", type=float, default=0.1)
+    parser.add_argument("--max-ticks", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Where to save the trained Q-table (.npy) or DQN weights")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    train(parse_args())
@@ -0,0 +1,55 @@
+from collections import deque
+import numpy as np
+
+# Distance transforms: for every tile, the distance to the nearest of a set of
+# source tiles, as a (height, width) int32 array indexed [y, x].
+
+def bfs_distances(nav_grid, sources):
+    """Path distances over walkable tiles by one multi-source BFS, -1 where no source is reachable"""
+    width, height = nav_grid.width, nav_grid.height
+    walkable = nav_grid.walkable.ravel().tolist()
+    distances = [-1] * (width * height)
+    queue = deque()
+    for x, y in sources:
+        if nav_grid.is_walkable(x, y) and distances[y * width + x] < 0:
+            distances[y * width + x] = 0
+            queue.append(y * width + x)
+
+    while queue:
+        index = queue.popleft()
+        next_distance = distances[index] + 1
+        x = index % width
+        for neighbor, valid in (
+            (index - 1, x > 0),
+            (index + 1, x < width - 1),
+            (index - width, index >= width),
+            (index + width, index < (height - 1) * width),
+        ):
+            if valid and walkable[neighbor] and distances[neighbor] < 0:
+                distances[neighbor] = next_distance
+                queue.append(neighbor)
+    return np.array(distances, dtype=np.int32).reshape(height, width)
+
+def manhattan_distances(shape, sources):
+    """Manhattan distances ignoring walls, computed in two vectorised passes.
+
+    min over sources of |x - sx| + |y - sy| splits into a pass along rows and
+    one along columns. Each pass uses min_j(g[j] + |i - j|) =
+    min(i + min_{j<=i}(g[j] - j), -i + min_{j>=i}(g[j] + j)), two running
+    minimums. Tiles are unbounded (width + height) if there are no sources.
+    """
+    height, width = shape
+    unreached = width + height
+    distances = np.full((height, width), unreached, dtype=np.int64)
+    sources = [(x, y) for x, y in sources if 0 <= x < width and 0 <= y < height]
+    if not sources:
+        return distances.astype(np.int32)
+    xs, ys = np.array(sources).T
+    distances[ys, xs] = 0
+
+    for axis, length in ((1, width), (0, height)):
+        offsets = np.arange(length).reshape((-1, 1) if axis == 0 else (1, -1))
+        forward = np.minimum.accumulate(distances - offsets, axis=axis) + offsets
+        backward = np.flip(np.minimum.accumulate(np.flip(distances + offsets, axis), axis=axis), axis) - offsets
+        distances = np.minimum(forward, backward)
+    return np.minimum(distances, unreached).astype(np.int32)
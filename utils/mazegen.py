@@ -0,0 +1,78 @@
+import itertools
+import numpy as np
+
+# All 24 orderings of the four carving directions (dx, dy in cell units)
+_DIRECTION_ORDERS = [list(order) for order in itertools.permutations([(0, -1), (0, 1), (-1, 0), (1, 0)])]
+
+def generate_maze_grid(cols, rows, seed=None, extra_connection_ratio=1 / 16):
+    """Recursive-backtracker maze as a (rows, cols) uint8 array, 1 = wall, 0 = floor.
+
+    Carves from (1, 1) with an explicit stack, so size is not limited by the
+    recursion limit, then opens roughly extra_connection_ratio of the tiles
+    that join two passages to give multiple routes.
+    """
+    rng = np.random.default_rng(seed)
+    maze = np.ones((rows, cols), dtype=np.uint8)
+
+    # Passable cells sit on odd coordinates; each is visited exactly once
+    cell_cols, cell_rows = cols // 2, rows // 2
+    num_cells = cell_cols * cell_rows
+    if num_cells == 0:
+        return maze
+
+    # Every cell gets its own shuffled direction order, as carve() did.
+    # Resolve each (cell, step) to a neighbouring cell index up front, -1 if off-grid
+    orders = np.array(_DIRECTION_ORDERS, dtype=np.int64)[rng.integers(0, len(_DIRECTION_ORDERS), num_cells)]
+    cell_x = np.arange(num_cells) % cell_cols
+    cell_y = np.arange(num_cells) // cell_cols
+    step_x = cell_x[:, None] + orders[:, :, 0]
+    step_y = cell_y[:, None] + orders[:, :, 1]
+    in_bounds = (step_x >= 0) & (step_x < cell_cols) & (step_y >= 0) & (step_y < cell_rows)
+    neighbors = np.where(in_bounds, step_y * cell_cols + step_x, -1).ravel().tolist()
+
+    next_step = [0] * num_cells
+    visited = bytearray(num_cells)
+    carved_steps = []  # (cell * 4 + step) for every wall knocked out
+
+    visited[0] = 1
+    stack = [0]
+    while stack:
+        cell = stack[-1]
+        step = next_step[cell]
+        base = cell * 4
+        while step < 4:
+            neighbor = neighbors[base + step]
+            step += 1
+            if neighbor >= 0 and not visited[neighbor]:
+                break
+        else:
+            stack.pop()
+            continue
+        next_step[cell] = step
+        visited[neighbor] = 1
+        carved_steps.append(base + step - 1)
+        stack.append(neighbor)
+
+    carved = np.array(carved_steps, dtype=np.int64)
+    carved_cells, carved_dirs = carved // 4, carved % 4
+    directions = orders[carved_cells, carved_dirs]
+    maze[1:2 * cell_rows:2, 1:2 * cell_cols:2] = 0
+    maze[2 * cell_y[carved_cells] + 1 + directions[:, 1], 2 * cell_x[carved_cells] + 1 + directions[:, 0]] = 0
+
+    add_connections(maze, rng, extra_connection_ratio)
+    return maze
+
+def add_connections(maze, rng, ratio):
+    """Open randomly sampled interior walls that touch at least two floor tiles"""
+    rows, cols = maze.shape
+    if rows < 3 or cols < 3:
+        return
+    samples = int(rows * cols * ratio)
+    xs = rng.integers(1, cols - 1, samples)
+    ys = rng.integers(1, rows - 1, samples)
+
+    floor = (maze == 0).astype(np.uint8)
+    open_neighbors = (floor[ys, xs - 1] + floor[ys, xs + 1] +
+                      floor[ys - 1, xs] + floor[ys + 1, xs])
+    connect = (maze[ys, xs] == 1) & (open_neighbors >= 2)
+    maze[ys[connect], xs[connect]] = 0
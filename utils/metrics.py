@@ -1,4 +1,5 @@
 import pygame
+import numpy as np
 
 class Metrics:
     def __init__(self):
@@ -31,3 +32,28 @@ class Metrics:
         print(f"Interception Rate: {self.interceptions}")
         print(f"Average Distance to Player: {self.get_average_distance():.2f} tiles")
         print(f"Time Taken to Capture Player: {self.get_time_taken():.2f} seconds")
+
+class LatencyTracker:
+    """Running mean plus a fixed-size ring buffer of recent samples for percentiles"""
+    def __init__(self, capacity=4096):
+        self.samples = np.zeros(capacity)
+        self.capacity = capacity
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds):
+        self.samples[self.count % self.capacity] = seconds
+        self.count += 1
+        self.total += seconds
+
+    def __len__(self):
+        return self.count
+
+    def get_average(self):
+        return self.total / self.count if self.count > 0 else 0
+
+    def get_percentile(self, percentile):
+        """Percentile over the most recent `capacity` samples"""
+        if self.count == 0:
+            return 0
+        return float(np.percentile(self.samples[:min(self.count, self.capacity)], percentile))
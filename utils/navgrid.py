@@ -0,0 +1,118 @@
+import itertools
+from collections import deque
+import numpy as np
+
+# Process-wide version counter, so a copied grid never shares a version with its source
+_versions = itertools.count(1)
+
+class NavGrid:
+    """Walkability grid shared by pathfinding, guard AI and collision checks"""
+    def __init__(self, maze):
+        # 1 = walkable, 0 = blocked (walls in the maze are 1, floor is 0)
+        self.walkable = (np.asarray(maze, dtype=np.uint8) == 0).astype(np.uint8)
+        self.height, self.width = self.walkable.shape
+        self.version = next(_versions)  # Bumped whenever the layout changes
+        self._components = None
+        self._wall_masks = None
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    def is_walkable(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and self.walkable[y, x] == 1
+
+    def set_walkable(self, x, y, walkable):
+        self.walkable[y, x] = 1 if walkable else 0
+        self.bump_version()
+
+    def bump_version(self):
+        """Mark the grid as changed so version-keyed caches stop matching"""
+        self.version = next(_versions)
+
+    def copy(self):
+        grid = NavGrid.__new__(NavGrid)
+        grid.walkable = self.walkable.copy()
+        grid.height, grid.width = self.height, self.width
+        grid.version = next(_versions)
+        grid._components = None
+        grid._wall_masks = None
+        return grid
+
+    def neighbors(self, pos):
+        """Walkable 4-neighbours of a tile"""
+        x, y = pos
+        return [
+            (x + dx, y + dy) for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            if self.is_walkable(x + dx, y + dy)
+        ]
+
+    def wall_masks(self, radius=2):
+        """Per-tile bitmask of walls in the surrounding (2r+1)^2 window, recomputed once per version.
+
+        Bit i is set when the i-th tile of the window in row-major order is a
+        wall or off the grid.
+        """
+        if self._wall_masks is None or self._wall_masks[:2] != (self.version, radius):
+            size = 2 * radius + 1
+            walls = np.pad(1 - self.walkable, radius, constant_values=1).astype(np.uint32)
+            masks = np.zeros((self.height, self.width), dtype=np.uint32)
+            for i in range(size * size):
+                dy, dx = divmod(i, size)
+                masks |= walls[dy:dy + self.height, dx:dx + self.width] << np.uint32(i)
+            self._wall_masks = (self.version, radius, masks)
+        return self._wall_masks[2]
+
+    def component_labels(self):
+        """Connected-component label per tile (0 = blocked), recomputed once per version"""
+        if self._components is None or self._components[0] != self.version:
+            self._components = (self.version, self._label_components(), {})
+        return self._components[1]
+
+    def _label_components(self):
+        width, height = self.width, self.height
+        walkable = self.walkable.ravel().tolist()
+        labels = [0] * (width * height)
+        label = 0
+        for seed in range(width * height):
+            if not walkable[seed] or labels[seed]:
+                continue
+            label += 1
+            labels[seed] = label
+            queue = deque([seed])
+            while queue:
+                index = queue.popleft()
+                x = index % width
+                for neighbor, valid in (
+                    (index - 1, x > 0),
+                    (index + 1, x < width - 1),
+                    (index - width, index >= width),
+                    (index + width, index < (height - 1) * width),
+                ):
+                    if valid and walkable[neighbor] and not labels[neighbor]:
+                        labels[neighbor] = label
+                        queue.append(neighbor)
+        return np.array(labels, dtype=np.int32).reshape(height, width)
+
+    def component_at(self, x, y):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        return int(self.component_labels()[y, x])
+
+    def same_component(self, a, b):
+        """O(1) reachability test between two tiles"""
+        label = self.component_at(*a)
+        return label != 0 and label == self.component_at(*b)
+
+    def nearest_in_component(self, label, target):
+        """Tile with the given label closest (Manhattan) to target, or None"""
+        labels = self.component_labels()
+        cells = self._components[2]
+        if label not in cells:
+            ys, xs = np.nonzero(labels == label)
+            cells[label] = (xs, ys)
+        xs, ys = cells[label]
+        if len(xs) == 0:
+            return None
+        best = int(np.argmin(np.abs(xs - target[0]) + np.abs(ys - target[1])))
+        return (int(xs[best]), int(ys[best]))
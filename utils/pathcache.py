@@ -0,0 +1,36 @@
+from collections import OrderedDict
+
+class PathCache:
+    """Bounded LRU cache of paths keyed on (start, end, grid version)"""
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, start, end, version):
+        key = (start, end, version)
+        path = self.paths.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.paths.move_to_end(key)
+        self.hits += 1
+        return list(path)  # Callers consume paths in place, so hand out a copy
+
+    def put(self, start, end, version, path):
+        key = (start, end, version)
+        self.paths[key] = tuple(path)
+        self.paths.move_to_end(key)
+        if len(self.paths) > self.maxsize:
+            self.paths.popitem(last=False)
+
+    def clear(self):
+        self.paths.clear()
+
+    def get_hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0
+
+    def print_metrics(self):
+        print(f"Path Cache Hits: {self.hits}, Misses: {self.misses} ({self.get_hit_rate():.0%} hit rate)")
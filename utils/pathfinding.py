@@ -0,0 +1,238 @@
+from heapq import heappop, heappush, nsmallest
+from utils.distance import bfs_distances
+
+# Pathfinding engines for uniform-cost 4-neighbour grids. Every engine takes
+# (nav_grid, start, end) and returns the full path including both endpoints,
+# or [] if end can't be reached. All engines return paths of the same length.
+
+def heuristic(a, b):
+    # Manhattan distance
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def reconstruct_path(came_from, current):
+    path = [current]
+    while current in came_from:
+        current = came_from[current]
+        path.append(current)
+    return path[::-1]
+
+def astar(nav_grid, start, end):
+    """Plain 4-neighbour A*"""
+    open_set = []
+    heappush(open_set, (0, start))
+    came_from = {}
+    g_score = {start: 0}
+    f_score = {start: heuristic(start, end)}
+
+    while open_set:
+        _, current = heappop(open_set)
+
+        if current == end:
+            return reconstruct_path(came_from, current)
+
+        for neighbor in nav_grid.neighbors(current):
+            tentative_g_score = g_score[current] + 1  # All moves cost 1
+
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, end)
+                heappush(open_set, (f_score[neighbor], neighbor))
+
+    return []  # No path found
+
+def bidirectional_astar(nav_grid, start, end):
+    """A* run from both ends at once, stopping when neither frontier can beat the best meeting"""
+    if start == end:
+        return [start]
+    if not nav_grid.is_walkable(*end):
+        return []  # Matches astar, which never steps onto a blocked goal
+
+    # Index 0 searches forward from start, index 1 backward from end
+    goals = (end, start)
+    g_scores = ({start: 0}, {end: 0})
+    came_from = ({}, {})
+    open_sets = ([(heuristic(start, end), start)], [(heuristic(end, start), end)])
+    closed = (set(), set())
+    best_cost = float('inf')
+    meeting = None
+
+    while open_sets[0] and open_sets[1]:
+        if max(open_sets[0][0][0], open_sets[1][0][0]) >= best_cost:
+            break
+
+        # Grow the smaller frontier
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        _, current = heappop(open_sets[side])
+        if current in closed[side]:
+            continue
+        closed[side].add(current)
+
+        g_score, other_g_score = g_scores[side], g_scores[1 - side]
+        for neighbor in nav_grid.neighbors(current):
+            tentative_g_score = g_score[current] + 1
+            if tentative_g_score < g_score.get(neighbor, float('inf')):
+                came_from[side][neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                heappush(open_sets[side], (tentative_g_score + heuristic(neighbor, goals[side]), neighbor))
+                if neighbor in other_g_score:
+                    total = tentative_g_score + other_g_score[neighbor]
+                    if total < best_cost:
+                        best_cost = total
+                        meeting = neighbor
+
+    if meeting is None:
+        return []
+    path = reconstruct_path(came_from[0], meeting)
+    backward = reconstruct_path(came_from[1], meeting)
+    return path + backward[::-1][1:]
+
+def _jump(is_walkable, x, y, dx, dy, end):
+    """Step from (x, y) in one direction until a jump point, the goal or a wall"""
+    while True:
+        x += dx
+        y += dy
+        if not is_walkable(x, y):
+            return None
+        if (x, y) == end:
+            return (x, y)
+        if dx != 0:
+            # Forced neighbour: a side opening that was walled off one tile back
+            if ((is_walkable(x, y - 1) and not is_walkable(x - dx, y - 1)) or
+                    (is_walkable(x, y + 1) and not is_walkable(x - dx, y + 1))):
+                return (x, y)
+        else:
+            if ((is_walkable(x - 1, y) and not is_walkable(x - 1, y - dy)) or
+                    (is_walkable(x + 1, y) and not is_walkable(x + 1, y - dy))):
+                return (x, y)
+            # Moving vertically, stop wherever a horizontal scan finds something
+            if _jump(is_walkable, x, y, 1, 0, end) or _jump(is_walkable, x, y, -1, 0, end):
+                return (x, y)
+
+def jump_point_search(nav_grid, start, end):
+    """Jump Point Search for 4-connected grids: A* over jump points only"""
+    is_walkable = nav_grid.is_walkable
+    open_set = [(heuristic(start, end), start)]
+    came_from = {}
+    g_score = {start: 0}
+    closed = set()
+
+    while open_set:
+        _, current = heappop(open_set)
+        if current == end:
+            jump_points = reconstruct_path(came_from, current)
+            # Fill in the straight runs between consecutive jump points
+            path = [jump_points[0]]
+            for x, y in jump_points[1:]:
+                px, py = path[-1]
+                step_x = (x > px) - (x < px)
+                step_y = (y > py) - (y < py)
+                while (px, py) != (x, y):
+                    px, py = px + step_x, py + step_y
+                    path.append((px, py))
+            return path
+        if current in closed:
+            continue
+        closed.add(current)
+
+        parent = came_from.get(current)
+        if parent is None:
+            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        else:
+            dx = (current[0] > parent[0]) - (current[0] < parent[0])
+            dy = (current[1] > parent[1]) - (current[1] < parent[1])
+            # Prune to the natural and possibly forced neighbours
+            directions = [(0, -1), (0, 1), (dx, 0)] if dx != 0 else [(-1, 0), (1, 0), (0, dy)]
+
+        for dx, dy in directions:
+            jump_point = _jump(is_walkable, current[0], current[1], dx, dy, end)
+            if jump_point is None:
+                continue
+            tentative_g_score = g_score[current] + heuristic(current, jump_point)
+            if tentative_g_score < g_score.get(jump_point, float('inf')):
+                came_from[jump_point] = current
+                g_score[jump_point] = tentative_g_score
+                heappush(open_set, (tentative_g_score + heuristic(jump_point, end), jump_point))
+
+    return []  # No path found
+
+def _spur_search(nav_grid, start, end, goal_distances, blocked_nodes, blocked_first_steps, max_cost):
+    """A* from start avoiding blocked tiles, guided by exact unblocked distances to end.
+
+    Blocking only lengthens paths, so the unblocked distances stay admissible
+    and consistent. Searches stop at max_cost, since longer spurs can't make
+    the cut. Returns the path or None.
+    """
+    if goal_distances[start[1], start[0]] < 0 or goal_distances[start[1], start[0]] > max_cost:
+        return None
+    open_set = [(goal_distances[start[1], start[0]], 0, start)]
+    came_from = {}
+    g_score = {start: 0}
+    while open_set:
+        _, cost, current = heappop(open_set)
+        if current == end:
+            return reconstruct_path(came_from, current)
+        if cost > g_score[current]:
+            continue
+        for neighbor in nav_grid.neighbors(current):
+            if neighbor in blocked_nodes or (current == start and neighbor in blocked_first_steps):
+                continue
+            tentative_g_score = cost + 1
+            estimate = tentative_g_score + int(goal_distances[neighbor[1], neighbor[0]])
+            if estimate > max_cost:
+                continue
+            if tentative_g_score < g_score.get(neighbor, float('inf')):
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                heappush(open_set, (estimate, tentative_g_score, neighbor))
+    return None
+
+def k_shortest_paths(nav_grid, start, end, k=3):
+    """Yen's algorithm: up to k distinct loopless paths as (cost, path), shortest first.
+
+    The grid is never copied: each spur search blocks the root path and the
+    already used first steps with sets. A single reverse BFS from end serves
+    as the exact heuristic for every spur search.
+    """
+    goal_distances = bfs_distances(nav_grid, [end])
+    if goal_distances[start[1], start[0]] < 0:
+        return []
+    unlimited = goal_distances.size
+    first = _spur_search(nav_grid, start, end, goal_distances, set(), set(), unlimited)
+    found = [first]
+    seen = {tuple(first)}
+    candidates = []  # Heap of (cost, path)
+
+    while len(found) < k:
+        last = found[-1]
+        needed = k - len(found)
+        for i in range(len(last) - 1):
+            root = last[:i + 1]
+            # Only a candidate cheaper than the needed-th best so far can still be picked
+            bound = nsmallest(needed, candidates)[-1][0] - 1 if len(candidates) >= needed else unlimited
+            blocked_first_steps = {path[i + 1] for path in found if len(path) > i + 1 and path[:i + 1] == root}
+            spur = _spur_search(nav_grid, last[i], end, goal_distances, set(root[:-1]),
+                                blocked_first_steps, bound - i)
+            if spur is None:
+                continue
+            path = tuple(root[:-1] + spur)
+            if path not in seen:
+                seen.add(path)
+                heappush(candidates, (len(path) - 1, path))
+        if not candidates:
+            break
+        _, path = heappop(candidates)
+        found.append(list(path))
+
+    return [(len(path) - 1, path) for path in found]
+
+PATHFINDERS = {
+    "astar": astar,
+    "bidirectional": bidirectional_astar,
+    "jps": jump_point_search,
+}
+
+def get_pathfinder(name):
+    if name not in PATHFINDERS:
+        raise ValueError(f"Unknown pathfinding engine {name!r}, expected one of {sorted(PATHFINDERS)}")
+    return PATHFINDERS[name]
@@ -0,0 +1,32 @@
+import random
+
+def sample_spaced(candidates, count, spacing, rng=random, accept=None):
+    """Pick up to count tiles from candidates, every pair at least spacing apart (Manhattan).
+
+    Dart throwing over the candidates: each draw removes its tile from the
+    pool by swapping it with the last one, and accepted tiles are bucketed on
+    a grid of spacing-sized cells, so a draw only checks the 3x3 buckets
+    around it. A rejected tile stays rejected as more tiles are accepted, so
+    every candidate is drawn at most once and the whole run is O(len(candidates)).
+    rng needs a randrange method, e.g. the random module or a random.Random.
+    accept, if given, is a predicate that drawn tiles must also pass.
+    """
+    pool = list(candidates)
+    chosen = []
+    buckets = {}
+    spacing = max(1, spacing)
+    while pool and len(chosen) < count:
+        i = rng.randrange(len(pool))
+        pool[i], pool[-1] = pool[-1], pool[i]
+        x, y = pool.pop()
+        if accept is not None and not accept((x, y)):
+            continue
+
+        bx, by = x // spacing, y // spacing
+        if any(abs(x - px) + abs(y - py) < spacing
+               for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+               for px, py in buckets.get((bx + dx, by + dy), ())):
+            continue
+        buckets.setdefault((bx, by), []).append((x, y))
+        chosen.append((x, y))
+    return chosen
@@ -0,0 +1,50 @@
+class SpatialHash:
+    """Entities bucketed by the tile they occupy, one bucket per (kind, tile).
+
+    Entities are identified by (kind, ident), e.g. ("guard", 2) or ("obstacle", 0).
+    move() only touches the two buckets involved, so keeping moving entities
+    indexed is O(1) per tile change, and query() looks at (2 * radius + 1) ** 2
+    buckets whatever the number of entities.
+    """
+    def __init__(self):
+        self.cells = {}  # (kind, tile) -> set of idents
+        self.tiles = {}  # (kind, ident) -> tile
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def clear(self):
+        self.cells.clear()
+        self.tiles.clear()
+
+    def insert(self, kind, ident, tile):
+        self.remove(kind, ident)
+        self.tiles[(kind, ident)] = tile
+        self.cells.setdefault((kind, tile), set()).add(ident)
+
+    def remove(self, kind, ident):
+        tile = self.tiles.pop((kind, ident), None)
+        if tile is None:
+            return
+        bucket = self.cells[(kind, tile)]
+        bucket.discard(ident)
+        if not bucket:
+            del self.cells[(kind, tile)]
+
+    def move(self, kind, ident, tile):
+        """Re-bucket an entity; returns False if it was already on that tile"""
+        if self.tiles.get((kind, ident)) == tile:
+            return False
+        self.insert(kind, ident, tile)
+        return True
+
+    def at(self, kind, tile):
+        """Idents of the given kind on one tile"""
+        return self.cells.get((kind, tile), ())
+
+    def query(self, kind, tile, radius=1):
+        """Idents of the given kind within radius tiles (Chebyshev) of tile"""
+        x, y = tile
+        for ty in range(y - radius, y + radius + 1):
+            for tx in range(x - radius, x + radius + 1):
+                yield from self.cells.get((kind, (tx, ty)), ())